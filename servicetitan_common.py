@@ -0,0 +1,568 @@
+from dotenv import load_dotenv
+import os
+import time
+import asyncio
+import inspect
+import itertools
+import logging
+import math
+import urllib.parse
+from contextlib import aclosing, asynccontextmanager
+from types import MappingProxyType
+import httpx
+import orjson
+import ijson
+from cachetools import TTLCache
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Mapping, Optional, Tuple
+
+try:
+    import h2  # noqa: F401 - only needed for httpx's HTTP/2 support
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+logger = logging.getLogger(__name__)
+
+# Required credential variables
+REQUIRED_ENV_VARS = (
+    "SERVICE_TITAN_CLIENT_ID",
+    "SERVICE_TITAN_CLIENT_SECRET",
+    "SERVICE_TITAN_APP_KEY",
+    "SERVICE_TITAN_TENANT_ID"
+)
+
+# Load .env values, skipping the file lookup when the environment already provides them
+if not all(os.getenv(name) for name in REQUIRED_ENV_VARS):
+    load_dotenv()
+
+# Env vars
+CLIENT_ID = os.getenv("SERVICE_TITAN_CLIENT_ID")
+CLIENT_SECRET = os.getenv("SERVICE_TITAN_CLIENT_SECRET")
+APP_KEY = os.getenv("SERVICE_TITAN_APP_KEY")
+TENANT_ID = os.getenv("SERVICE_TITAN_TENANT_ID")
+
+# The credentials never change after startup, so check them once here rather than on every token fetch
+_missing_env_vars = [name for name in REQUIRED_ENV_VARS if not os.getenv(name)]
+if _missing_env_vars:
+    raise ValueError(f"ERROR_ENV: Missing required ServiceTitan environment variables: {', '.join(_missing_env_vars)}")
+
+# OAuth URL
+TOKEN_URL = "https://auth.servicetitan.io/connect/token"
+
+# Form-encoded token request, built once since the credentials never change
+_TOKEN_BODY = urllib.parse.urlencode({
+    "grant_type": "client_credentials",
+    "client_id": CLIENT_ID,
+    "client_secret": CLIENT_SECRET
+}).encode()
+_TOKEN_HEADERS = { "Content-Type": "application/x-www-form-urlencoded" }
+
+# HTTP connection pool limits (read once at import)
+MAX_CONNECTIONS = int(os.getenv("ST_MAX_CONNECTIONS", "100"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("ST_MAX_KEEPALIVE", "50"))
+# Seconds an idle connection is kept open; just under ServiceTitan's own idle timeout
+# so connections stay warm between bursts of tool calls without being reset
+KEEPALIVE_EXPIRY = float(os.getenv("ST_KEEPALIVE_EXPIRY", "75"))
+
+# Timeouts for every request on the shared client, so a hung endpoint can't wedge a tool call
+HTTP_TIMEOUT = httpx.Timeout(
+    connect=float(os.getenv("HTTP_CONNECT_TIMEOUT", "5")),
+    read=float(os.getenv("HTTP_TIMEOUT", "30")),
+    write=float(os.getenv("HTTP_TIMEOUT", "30")),
+    pool=10.0
+)
+
+# Maximum number of requests in flight to ServiceTitan at once
+MAX_CONCURRENCY = int(os.getenv("ST_MAX_CONCURRENCY", "8"))
+
+# Retry policy: failed connects are retried by the transport for any method,
+# 429s for any method (the request was rejected, not processed) and 5xx
+# responses only for idempotent GETs
+MAX_RETRIES = 3
+RETRY_BACKOFF_SECONDS = 0.5
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# Shared HTTP client, created on first use by get_client()
+_CLIENT: Optional[httpx.AsyncClient] = None
+
+# Caps concurrent requests so bursts of tool calls don't trip ServiceTitan's rate limits
+_SEMAPHORE = asyncio.Semaphore(MAX_CONCURRENCY)
+
+# Request headers that never change; Authorization is added per token
+_STATIC_HEADERS = {"ST-App-Key": APP_KEY}
+_JSON_HEADERS = {**_STATIC_HEADERS, "Content-Type": "application/json"}
+_BEARER_PREFIX = "Bearer "
+
+# Refresh the token this many seconds before ServiceTitan expires it
+TOKEN_EXPIRY_MARGIN = 60
+
+# Cached access token and the read-only request headers built from it, shared by every request
+_token_cache = {"access_token": None, "headers": None, "json_headers": None, "expires_at": 0.0}
+
+# Serializes token refreshes so concurrent callers share a single fetch
+_token_lock = asyncio.Lock()
+
+# Cached GET responses keyed by (url, params), stored as (etag, raw body bytes) so
+# every hit decodes its own copy and callers can't mutate what others will get
+_response_cache = TTLCache(maxsize=1024, ttl=60)
+
+def get_client() -> httpx.AsyncClient:
+    """
+    Return the shared pooled HTTP client, creating it on first use.
+
+    Every ServiceTitan server in the process multiplexes over its HTTP/2
+    connections (HTTP/1.1 keep-alive if httpx was installed without the
+    http2 extra). A client closed by client_lifespan is replaced on the next call.
+    """
+    global _CLIENT
+    if _CLIENT is None or _CLIENT.is_closed:
+        _CLIENT = httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_connections=MAX_CONNECTIONS,
+                    max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=KEEPALIVE_EXPIRY
+                ),
+                retries=MAX_RETRIES
+            ),
+            timeout=HTTP_TIMEOUT
+        )
+    return _CLIENT
+
+@asynccontextmanager
+async def client_lifespan(server: Any) -> AsyncIterator[None]:
+    """FastMCP lifespan that closes the shared HTTP client when the server shuts down."""
+    try:
+        yield
+    finally:
+        if _CLIENT is not None:
+            await _CLIENT.aclose()
+
+async def warm_up(base_url: str, endpoint: str, params: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Fetch the access token and open a pooled connection ahead of the first tool call.
+
+    Best effort: a failure is only logged, since the first real request will retry it.
+    """
+    try:
+        response = await send_authorized("GET", f"{base_url}{endpoint}", params=params)
+        logger.debug("Warmed up %s over %s", base_url, response.http_version)
+    except Exception as e:
+        logger.warning("Connection warmup for %s failed: %s", base_url, e)
+
+def warmup_lifespan(base_url: str, endpoint: str, params: Optional[Dict[str, Any]] = None):
+    """
+    Return a FastMCP lifespan that warms the connection pool in the background at startup.
+
+    The server starts answering immediately; the token fetch and TLS handshake
+    run alongside it instead of delaying the first tool call. The shared client
+    is closed on shutdown, as with client_lifespan.
+    """
+    @asynccontextmanager
+    async def lifespan(server: Any) -> AsyncIterator[None]:
+        async with client_lifespan(server):
+            task = asyncio.create_task(warm_up(base_url, endpoint, params))
+            try:
+                yield
+            finally:
+                task.cancel()
+
+    return lifespan
+
+def install_event_loop() -> None:
+    """
+    Run the server on uvloop when it is installed, for lower per-request overhead.
+
+    Call before mcp.run(); falls back to the default asyncio loop otherwise
+    (uvloop is not available on Windows).
+    """
+    if uvloop is not None:
+        uvloop.install()
+
+def _cached_token() -> Optional[str]:
+    """Return the cached access token if it is still valid."""
+    if _token_cache["access_token"] and time.monotonic() < _token_cache["expires_at"]:
+        return _token_cache["access_token"]
+    return None
+
+async def get_access_token() -> str:
+    """
+    Return a cached OAuth2 access token, fetching a new one from ServiceTitan when it expires.
+
+    Only one refresh runs at a time; callers that arrive while it is in flight
+    wait for it and reuse its token instead of fetching their own.
+    """
+    access_token = _cached_token()
+    if access_token:
+        return access_token
+
+    async with _token_lock:
+        access_token = _cached_token()
+        if access_token:
+            return access_token
+        return await _fetch_access_token()
+
+async def _fetch_access_token() -> str:
+    """Fetch a new access token from ServiceTitan and cache it with its request headers."""
+    response = await get_client().post(TOKEN_URL, content=_TOKEN_BODY, headers=_TOKEN_HEADERS)
+    response.raise_for_status()
+    token_response_json = orjson.loads(response.content)
+
+    access_token = token_response_json.get("access_token")
+
+    if not isinstance(access_token, str):
+        error_msg = f"ERROR_TOKEN: access_token is not a string or is missing. Type: {type(access_token)}, Value: {access_token}"
+        raise TypeError(error_msg)
+
+    expires_in = token_response_json.get("expires_in", 900)
+    authorization = {"Authorization": _BEARER_PREFIX + access_token}
+    _token_cache["access_token"] = access_token
+    _token_cache["headers"] = MappingProxyType({**authorization, **_STATIC_HEADERS})
+    _token_cache["json_headers"] = MappingProxyType({**authorization, **_JSON_HEADERS})
+    _token_cache["expires_at"] = time.monotonic() + expires_in - TOKEN_EXPIRY_MARGIN
+
+    return access_token
+
+def invalidate_token(token: Optional[str] = None) -> None:
+    """
+    Drop the cached access token so the next request fetches a new one.
+
+    If `token` is given it is only dropped while it is still the cached one, so
+    concurrent requests rejected with the same token trigger a single refresh.
+    """
+    if token is not None and token != _token_cache["access_token"]:
+        return
+    _token_cache["access_token"] = None
+    _token_cache["expires_at"] = 0.0
+
+async def get_auth_headers(json_body: bool = False) -> Mapping[str, str]:
+    """
+    Return the request headers for the current access token.
+
+    The same read-only mapping is returned until the token is refreshed;
+    copy it to add per-request headers.
+    """
+    await get_access_token()
+    return _token_cache["json_headers"] if json_body else _token_cache["headers"]
+
+def invalidate_cache(base_url: str, endpoint: str) -> None:
+    """Drop cached GET responses for an endpoint (for every query string), e.g. after it was modified."""
+    url = f"{base_url}{endpoint}"
+    for key in [key for key in _response_cache if key[0] == url]:
+        _response_cache.pop(key, None)
+
+def _cache_key(url: str, params: Optional[Dict[str, Any]]) -> tuple:
+    """Hashable response cache key; list values (e.g. repeated query params) become tuples."""
+    if not params:
+        return (url, ())
+    return (url, tuple(sorted(
+        (k, tuple(v) if isinstance(v, list) else v) for k, v in params.items()
+    )))
+
+def clean_params(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Remove None values from parameters"""
+    return {k: v for k, v in params.items() if v is not None}
+
+def _retry_delay(response: httpx.Response, attempt: int) -> float:
+    """Seconds to wait before retrying, honoring Retry-After when ServiceTitan sends it."""
+    retry_after = response.headers.get("Retry-After")
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+    return RETRY_BACKOFF_SECONDS * 2 ** attempt
+
+def _should_retry(method: str, status_code: int) -> bool:
+    """Whether a response status is worth retrying for the given method."""
+    if status_code == 429:
+        return True
+    return method == "GET" and status_code in RETRY_STATUS_CODES
+
+async def _send(method: str, url: str, stream: bool = False, **kwargs: Any) -> httpx.Response:
+    """
+    Send a request on the shared client, retrying 429s (and 5xx for GETs) with exponential backoff.
+
+    At most MAX_CONCURRENCY requests are in flight at once; the slot is released while backing off.
+    With stream=True the body is left unread, and the slot is released once the
+    response headers arrive; the caller must close the response.
+    """
+    client = get_client()
+    for attempt in range(MAX_RETRIES + 1):
+        async with _SEMAPHORE:
+            response = await client.send(client.build_request(method, url, **kwargs), stream=stream)
+        if not _should_retry(method, response.status_code) or attempt == MAX_RETRIES:
+            return response
+
+        if stream:
+            await response.aclose()
+        delay = _retry_delay(response, attempt)
+        logger.debug("%s %s returned %s, retrying in %.1fs", method, url, response.status_code, delay)
+        await asyncio.sleep(delay)
+
+async def send_authorized(
+    method: str,
+    url: str,
+    extra_headers: Optional[Dict[str, str]] = None,
+    stream: bool = False,
+    **kwargs: Any
+) -> httpx.Response:
+    """
+    Send an authenticated request on the shared client.
+
+    If ServiceTitan rejects the cached token with a 401 (e.g. it was revoked
+    before its expiry), the token is refetched and the request sent once more.
+    With stream=True the body is left unread and the caller must close the response.
+    """
+    json_body = kwargs.get("content") is not None or kwargs.get("json") is not None
+    for attempt in range(2):
+        headers = await get_auth_headers(json_body=json_body)
+        token = _token_cache["access_token"]
+        if extra_headers:
+            headers = {**headers, **extra_headers}
+        response = await _send(method, url, stream=stream, headers=headers, **kwargs)
+        if response.status_code != 401 or attempt:
+            break
+        if stream:
+            await response.aclose()
+        logger.debug("%s %s returned 401, refreshing the access token", method, url)
+        invalidate_token(token)
+    return response
+
+def _decode(response: httpx.Response) -> Any:
+    """Decode a JSON response body, treating an empty body as an empty object."""
+    return orjson.loads(response.content) if response.content else {}
+
+async def request(
+    base_url: str,
+    method: str,
+    endpoint: str,
+    params: Optional[Dict[str, Any]] = None,
+    json_data: Any = None,
+    cache: bool = False,
+    not_found_msg: Optional[str] = None,
+    none_on_404: bool = False
+) -> Any:
+    """
+    Make an authenticated request to a ServiceTitan API and return the decoded JSON body.
+
+    Args:
+        base_url: API base URL of the calling server (including the tenant)
+        method: HTTP method
+        endpoint: Path relative to base_url
+        params: Query parameters; None values are dropped
+        json_data: JSON request body
+        cache: Cache GET responses for a short time, revalidating with the ETag if one was sent
+        not_found_msg: If given, a 404 returns {"error": not_found_msg} instead of raising
+        none_on_404: Return None on a 404 instead of raising, so callers can tell
+            "not found" apart from any body the API sends back
+
+    Raises:
+        httpx.HTTPStatusError: If ServiceTitan returns any other error status.
+    """
+    url = f"{base_url}{endpoint}"
+    if not params:
+        params = None
+    elif None in params.values():
+        params = clean_params(params)
+
+    if method == "GET" and cache:
+        cache_key = _cache_key(url, params)
+        cached = _response_cache.get(cache_key)
+        conditional = None
+        if cached is not None:
+            etag, content = cached
+            if etag is None:
+                return orjson.loads(content) if content else {}
+            conditional = {"If-None-Match": etag}
+
+        response = await send_authorized("GET", url, extra_headers=conditional, params=params)
+        logger.debug("GET %s served over %s", url, response.http_version)
+
+        status = response.status_code
+        if status == 304 and cached is not None:
+            _response_cache[cache_key] = cached
+            return orjson.loads(content) if content else {}
+        if 200 <= status < 300:
+            body = _decode(response)
+            _response_cache[cache_key] = (response.headers.get("ETag"), response.content)
+            return body
+        return _error_result(response, not_found_msg, none_on_404)
+
+    content = orjson.dumps(json_data) if json_data is not None else None
+    response = await send_authorized(method, url, params=params, content=content)
+    logger.debug("%s %s served over %s", method, url, response.http_version)
+
+    if 200 <= response.status_code < 300:
+        return _decode(response)
+    return _error_result(response, not_found_msg, none_on_404)
+
+def _error_result(
+    response: httpx.Response,
+    not_found_msg: Optional[str],
+    none_on_404: bool = False
+) -> Optional[Dict[str, str]]:
+    """
+    Map a 404 to None (none_on_404) or {"error": not_found_msg} when one is given;
+    raise HTTPStatusError for anything else.
+    """
+    if response.status_code == 404:
+        if none_on_404:
+            return None
+        if not_found_msg is not None:
+            return {"error": not_found_msg}
+    raise httpx.HTTPStatusError(
+        f"ServiceTitan returned {response.status_code} for {response.request.method} {response.request.url}",
+        request=response.request,
+        response=response
+    )
+
+def make_list_tool(
+    base_url: str,
+    name: str,
+    path: str,
+    summary: str,
+    params: Tuple[Tuple[str, str, Any, Any, str], ...],
+    convert: Optional[Callable[[Any], Any]] = None,
+    not_found_msg: Optional[str] = None,
+    cache: bool = False
+) -> Callable[..., Awaitable[dict]]:
+    """
+    Build a GET list tool whose signature and docstring come from its parameter table.
+
+    Each params entry is (argument, query parameter, annotation, default, description).
+    convert, if given, is applied to every non-None argument before it goes into the
+    query. The caller registers the returned function with its server (mcp.tool()).
+    """
+    query_keys = tuple(query for _, query, _, _, _ in params)
+    signature = inspect.Signature(
+        [
+            inspect.Parameter(arg, inspect.Parameter.KEYWORD_ONLY, default=default, annotation=annotation)
+            for arg, _, annotation, default, _ in params
+        ],
+        return_annotation=dict
+    )
+
+    async def list_tool(**kwargs: Any) -> dict:
+        arguments = signature.bind(**kwargs)
+        arguments.apply_defaults()
+        # Bound arguments are in signature order, which is the order of query_keys
+        query = {k: v for k, v in zip(query_keys, arguments.arguments.values()) if v is not None}
+        if convert is not None:
+            query = {k: convert(v) for k, v in query.items()}
+        return await request(base_url, "GET", path, params=query, cache=cache, not_found_msg=not_found_msg)
+
+    list_tool.__name__ = list_tool.__qualname__ = name
+    list_tool.__doc__ = f"\n    {summary}\n\n    Args:\n" + "".join(
+        f"        {arg}: {description}\n" for arg, _, _, _, description in params
+    ) + "    "
+    list_tool.__signature__ = signature
+    return list_tool
+
+async def fetch_all_pages(
+    fetch_page: Callable[[int, bool], Awaitable[Any]],
+    page_size: int,
+    concurrency: int = MAX_CONCURRENCY
+) -> Dict[str, Any]:
+    """
+    Fetch every page of a paged list and merge their records.
+
+    fetch_page(page, include_total) requests one page of `page_size` records.
+    Page 1 reports the total count, then the remaining pages are requested
+    concurrently, at most `concurrency` at a time.
+
+    Returns page 1 unchanged if it is an error result. Otherwise returns
+    {"data": [...], "totalCount": n, "errors": [...]}: data holds the records of
+    every page that succeeded, in page order, and each failed page is listed in
+    errors with its page number, so len(data) falls short of totalCount exactly
+    when errors is not empty.
+    """
+    first = await fetch_page(1, True)
+    if "error" in first:
+        return first
+
+    total = first.get("totalCount") or 0
+    pages = math.ceil(total / page_size)
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def fetch(page: int) -> Any:
+        async with semaphore:
+            return await fetch_page(page, False)
+
+    responses = await asyncio.gather(*(fetch(page) for page in range(2, pages + 1)), return_exceptions=True)
+
+    pages_data = [first.get("data", [])]
+    errors = []
+    for page, response in enumerate(responses, start=2):
+        if isinstance(response, Exception):
+            errors.append({"page": page, "error": "Request failed", "message": str(response)})
+        elif "error" in response:
+            errors.append({"page": page, **response})
+        else:
+            pages_data.append(response.get("data", []))
+    return {"data": list(itertools.chain.from_iterable(pages_data)), "totalCount": total, "errors": errors}
+
+class _AsyncByteReader:
+    """Async file-like adapter so ijson can parse an httpx byte stream."""
+
+    def __init__(self, chunks: AsyncIterator[bytes]):
+        self._chunks = chunks
+
+    async def read(self, size: int = -1) -> bytes:
+        if size == 0:
+            return b""
+        try:
+            return await self._chunks.__anext__()
+        except StopAsyncIteration:
+            return b""
+
+async def stream_items(
+    base_url: str,
+    endpoint: str,
+    params: Optional[Dict[str, Any]] = None,
+    prefix: str = "data.item"
+) -> AsyncIterator[Any]:
+    """
+    Stream a GET response and yield the items under `prefix` while the body is still arriving.
+
+    Keeps memory flat for large pages instead of buffering and parsing the whole body.
+    Numbers are decoded as int/float, matching request(). The request gets the same
+    retries and 401 token refresh as request(); its concurrency slot is released once
+    the response headers arrive, so no slot is held while the caller consumes items.
+    """
+    params = clean_params(params) if params else None
+
+    response = await send_authorized("GET", f"{base_url}{endpoint}", params=params, stream=True)
+    try:
+        if response.is_error:
+            # Read the (small) error body so HTTPStatusError handlers can use response.text
+            await response.aread()
+            response.raise_for_status()
+        reader = _AsyncByteReader(response.aiter_bytes())
+        async for item in ijson.items_async(reader, prefix, use_float=True):
+            yield item
+    finally:
+        await response.aclose()
+
+async def fetch_streamed(
+    base_url: str,
+    endpoint: str,
+    params: Optional[Dict[str, Any]] = None
+) -> Any:
+    """
+    GET a JSON document, decoding it incrementally as the body arrives.
+
+    Returns the same value as request(), but the raw body is never held in
+    memory alongside the decoded objects, which lowers peak memory for
+    multi-megabyte export pages.
+    """
+    async with aclosing(stream_items(base_url, endpoint, params, prefix="")) as documents:
+        async for document in documents:
+            return document
+    return {}
@@ -1,82 +1,54 @@
 from mcp.server.fastmcp import FastMCP
-from dotenv import load_dotenv
-import os
+import logging
+import asyncio
 import httpx
 from typing import Optional, List
+from servicetitan_common import TENANT_ID, request
 
-# Load .env values
-load_dotenv()
+logger = logging.getLogger(__name__)
 
-# Env vars
-CLIENT_ID = os.getenv("SERVICE_TITAN_CLIENT_ID")
-CLIENT_SECRET = os.getenv("SERVICE_TITAN_CLIENT_SECRET")
-APP_KEY = os.getenv("SERVICE_TITAN_APP_KEY")
-TENANT_ID = os.getenv("SERVICE_TITAN_TENANT_ID")
-
-# OAuth + API URLs
-TOKEN_URL = "https://auth.servicetitan.io/connect/token"
+# API URL
 BASE_URL = f"https://api.servicetitan.io/marketingads/v2/tenant/{TENANT_ID}"
 
 # FastMCP instance for Marketing Ads ServiceTitan API
 mcp = FastMCP("servicetitan-marketing-ads")
 
-async def get_access_token() -> str:
-    """Fetch OAuth2 access token from ServiceTitan."""
-    if not CLIENT_ID or not CLIENT_SECRET:
-        raise ValueError("CLIENT_ID and CLIENT_SECRET must be set")
-    
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            TOKEN_URL,
-            data={
-                "grant_type": "client_credentials",
-                "client_id": CLIENT_ID,
-                "client_secret": CLIENT_SECRET,
-            },
-            headers={"Content-Type": "application/x-www-form-urlencoded"}
-        )
-        
-        if response.status_code != 200:
-            raise Exception(f"Failed to get access token: {response.status_code}")
-        
-        return response.json()["access_token"]
+# Query parameter names, in the same order as the tool arguments
+_ATTRIBUTED_LEADS_KEYS = ("fromUtc", "toUtc", "leadType", "page", "pageSize", "includeTotal")
+_PERFORMANCE_KEYS = ("fromUtc", "toUtc", "performanceSegmentationType", "page", "pageSize", "includeTotal")
 
-def clean_params(params: dict) -> dict:
-    """Remove None values from parameters."""
-    return {k: v for k, v in params.items() if v is not None}
+# Attribution kind -> (endpoint, body key for the attributed entity)
+ATTRIBUTION_ENDPOINTS = {
+    "job": ("/job-attributions", "jobId"),
+    "web_booking": ("/web-booking-attributions", "bookingId"),
+    "web_lead_form": ("/web-lead-form-attributions", "leadId"),
+    "external_call": ("/external-call-attributions", "externalCallData"),
+}
 
 async def make_request(method: str, endpoint: str, params: dict = None, json_data: dict = None):
     """Make authenticated request to ServiceTitan Marketing Ads API."""
     try:
-        token = await get_access_token()
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "ST-App-Key": APP_KEY,
-            "Content-Type": "application/json"
+        if method not in ("GET", "POST", "PATCH"):
+            raise ValueError(f"Unsupported HTTP method: {method}")
+
+        return await request(
+            BASE_URL, method, endpoint,
+            params=params,
+            json_data=json_data,
+            cache=method == "GET"
+        )
+
+    except httpx.HTTPStatusError as e:
+        return {
+            "error": f"HTTP {e.response.status_code}",
+            "message": e.response.text
         }
-        
-        url = f"{BASE_URL}{endpoint}"
-        cleaned_params = clean_params(params) if params else None
-        
-        async with httpx.AsyncClient() as client:
-            if method == "GET":
-                response = await client.get(url, headers=headers, params=cleaned_params)
-            elif method == "POST":
-                response = await client.post(url, headers=headers, params=cleaned_params, json=json_data)
-            elif method == "PATCH":
-                response = await client.patch(url, headers=headers, params=cleaned_params, json=json_data)
-            else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
-        
-        if response.status_code in [200, 201]:
-            return response.json()
-        else:
-            return {
-                "error": f"HTTP {response.status_code}",
-                "message": response.text
-            }
-    
+
     except Exception as e:
+        # Anything else (transport errors, a malformed token response, ...) still
+        # comes back as an error dict, never as an exception out of the tool
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.exception("%s %s failed", method, endpoint)
         return {
             "error": "Request failed",
             "message": str(e)
@@ -110,14 +82,7 @@ async def get_attributed_leads(
         Paginated response with attributed leads data including attribution details,
         job info, customer info, call details, lead forms, and bookings.
     """
-    params = {
-        "fromUtc": from_utc,
-        "toUtc": to_utc,
-        "leadType": lead_type,
-        "page": page,
-        "pageSize": page_size,
-        "includeTotal": include_total
-    }
+    params = dict(zip(_ATTRIBUTED_LEADS_KEYS, (from_utc, to_utc, lead_type, page, page_size, include_total)))
     
     return await make_request("GET", "/attributed-leads", params)
 
@@ -164,14 +129,7 @@ async def get_performance_data(
         Paginated response with performance data including campaign, ad group, keyword info,
         digital stats (impressions, clicks, conversions), lead stats, and ROI.
     """
-    params = {
-        "fromUtc": from_utc,
-        "toUtc": to_utc,
-        "performanceSegmentationType": performance_segmentation_type,
-        "page": page,
-        "pageSize": page_size,
-        "includeTotal": include_total
-    }
+    params = dict(zip(_PERFORMANCE_KEYS, (from_utc, to_utc, performance_segmentation_type, page, page_size, include_total)))
     
     return await make_request("GET", "/performance", params)
 
@@ -327,5 +285,68 @@ async def attribute_web_lead_form(
     
     return await make_request("POST", "/web-lead-form-attributions", json_data=json_data)
 
+@mcp.tool()
+async def batch_attribute(
+    web_session_data: dict,
+    calls: List[dict]
+) -> List[dict]:
+    """
+    Attribute many jobs, bookings, lead forms and external calls to a web session at once.
+
+    The attribution requests are sent concurrently rather than one tool call at a time.
+
+    Args:
+        web_session_data: Web session information shared by every attribution
+            (same fields as attribute_job)
+        calls: List of attributions, each containing:
+            - kind: One of "job", "web_booking", "web_lead_form", "external_call"
+            - id: ID of the job, booking or lead to attribute (job, web_booking, web_lead_form)
+            - external_call_data: External call information (external_call only,
+              same fields as attribute_external_call)
+
+    Returns:
+        List of per-item results in the same order as `calls`. Failed items
+        contain an "error" key so partial failures are visible.
+    """
+    prepared = []
+    for call in calls:
+        kind = call.get("kind")
+        if kind not in ATTRIBUTION_ENDPOINTS:
+            prepared.append({
+                "error": "Invalid attribution kind",
+                "message": f"Unsupported kind: {kind}"
+            })
+            continue
+
+        endpoint, body_key = ATTRIBUTION_ENDPOINTS[kind]
+        value = call.get("external_call_data") if kind == "external_call" else call.get("id")
+        if value is None:
+            prepared.append({
+                "error": "Missing attribution target",
+                "message": f"No target supplied for {kind} attribution"
+            })
+            continue
+
+        json_data = {
+            "webSessionData": web_session_data,
+            body_key: value
+        }
+        prepared.append(make_request("POST", endpoint, json_data=json_data))
+
+    pending = [item for item in prepared if not isinstance(item, dict)]
+    responses = iter(await asyncio.gather(*pending, return_exceptions=True))
+
+    results = []
+    for item in prepared:
+        if isinstance(item, dict):
+            results.append(item)
+            continue
+        response = next(responses)
+        if isinstance(response, Exception):
+            response = {"error": "Request failed", "message": str(response)}
+        results.append(response)
+
+    return results
+
 if __name__ == "__main__":
     mcp.run(transport="stdio") 
\ No newline at end of file
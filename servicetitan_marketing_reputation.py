@@ -1,58 +1,24 @@
-import os
 import logging
 from mcp.server.fastmcp import FastMCP
 from typing import Optional, Dict, Any, List
-from dotenv import load_dotenv
-import httpx
+from servicetitan_common import TENANT_ID, request
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Load .env values
-load_dotenv()
-
 # Initialize MCP app
 mcp = FastMCP("ServiceTitan Marketing Reputation")
 
-# Environment variables
-CLIENT_ID = os.getenv("SERVICE_TITAN_CLIENT_ID")
-CLIENT_SECRET = os.getenv("SERVICE_TITAN_CLIENT_SECRET")
-APP_KEY = os.getenv("SERVICE_TITAN_APP_KEY")
-TENANT_ID = os.getenv("SERVICE_TITAN_TENANT_ID")
-
-# OAuth + API URLs
-TOKEN_URL = "https://auth.servicetitan.io/connect/token"
+# API URL
 BASE_URL = f"https://api.servicetitan.io/marketingreputation/v2/tenant/{TENANT_ID}"
 
-async def get_access_token() -> str:
-    """Fetch OAuth2 access token from ServiceTitan."""
-    if not CLIENT_ID or not CLIENT_SECRET or not APP_KEY or not TENANT_ID:
-        error_msg = "ERROR_ENV: One or more ServiceTitan environment variables are not set."
-        raise ValueError(error_msg)
-
-    async with httpx.AsyncClient() as client:
-        headers = { "Content-Type": "application/x-www-form-urlencoded" }
-        data = {
-            "grant_type": "client_credentials",
-            "client_id": CLIENT_ID,
-            "client_secret": CLIENT_SECRET
-        }
-        response = await client.post(TOKEN_URL, data=data, headers=headers)
-        response.raise_for_status()
-        token_response_json = response.json()
-        
-        access_token = token_response_json.get("access_token")
-        
-        if not isinstance(access_token, str):
-            error_msg = f"ERROR_TOKEN: access_token is not a string or is missing. Type: {type(access_token)}, Value: {access_token}"
-            raise TypeError(error_msg)
-            
-        return access_token
-
-def clean_params(params: Dict[str, Any]) -> Dict[str, Any]:
-    """Remove None values from parameters"""
-    return {k: v for k, v in params.items() if v is not None}
+# Query parameter names for get_reviews, in the same order as its arguments
+_REVIEWS_KEYS = (
+    "page", "pageSize", "includeTotal", "search", "reportType", "sort",
+    "createdOnOrAfter", "createdBefore", "modifiedOnOrAfter", "modifiedBefore",
+    "fromDate", "toDate", "responseTypes", "locationIds", "sources", "reviewStatuses",
+    "technicianIds", "campaignIds", "fromRating", "toRating",
+    "includeReviewsWithoutLocation", "includeReviewsWithoutCampaign", "includeReviewsWithoutTechnician"
+)
 
 @mcp.tool()
 async def get_reviews(
@@ -135,49 +101,17 @@ async def get_reviews(
               - technicianFullName: Technician full name
               - technicianId: Technician ID
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY
-    }
-
-    url = f"{BASE_URL}/reviews"
-
-    params = {
-        "page": page,
-        "pageSize": page_size,
-        "includeTotal": include_total,
-        "search": search,
-        "reportType": report_type,
-        "sort": sort,
-        "createdOnOrAfter": created_on_or_after,
-        "createdBefore": created_before,
-        "modifiedOnOrAfter": modified_on_or_after,
-        "modifiedBefore": modified_before,
-        "fromDate": from_date,
-        "toDate": to_date,
-        "responseTypes": response_types,
-        "locationIds": location_ids,
-        "sources": sources,
-        "reviewStatuses": review_statuses,
-        "technicianIds": technician_ids,
-        "campaignIds": campaign_ids,
-        "fromRating": from_rating,
-        "toRating": to_rating,
-        "includeReviewsWithoutLocation": include_reviews_without_location,
-        "includeReviewsWithoutCampaign": include_reviews_without_campaign,
-        "includeReviewsWithoutTechnician": include_reviews_without_technician
-    }
-
-    # Remove None values from params
-    clean_params_dict = clean_params(params)
+    params = dict(zip(_REVIEWS_KEYS, (
+        page, page_size, include_total, search, report_type, sort,
+        created_on_or_after, created_before, modified_on_or_after, modified_before,
+        from_date, to_date, response_types, location_ids, sources, review_statuses,
+        technician_ids, campaign_ids, from_rating, to_rating,
+        include_reviews_without_location, include_reviews_without_campaign, include_reviews_without_technician
+    )))
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers, params=clean_params_dict)
-        if response.status_code == 404:
-            return {"error": "Reviews not found"}
-        response.raise_for_status()
-        return response.json()
+    return await request(BASE_URL, "GET", "/reviews", params=params, cache=True, not_found_msg="Reviews not found")
 
 if __name__ == "__main__":
+    # Configure logging only when run as a server, not when imported
+    logging.basicConfig(level=logging.INFO)
     mcp.run(transport="stdio") 
\ No newline at end of file
@@ -1,149 +1,143 @@
-import os
+import inspect
 import logging
 from mcp.server.fastmcp import FastMCP
-from typing import Optional, Dict, Any, List
-from dotenv import load_dotenv
-import httpx
+from typing import Optional, Dict, Any
+from servicetitan_common import (
+    TENANT_ID, client_lifespan, fetch_all_pages, fetch_streamed, invalidate_cache, make_list_tool, request
+)
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Load .env values
-load_dotenv()
-
 # Initialize MCP app
-mcp = FastMCP("ServiceTitan Memberships")
-
-# Environment variables
-CLIENT_ID = os.getenv("SERVICE_TITAN_CLIENT_ID")
-CLIENT_SECRET = os.getenv("SERVICE_TITAN_CLIENT_SECRET")
-APP_KEY = os.getenv("SERVICE_TITAN_APP_KEY")
-TENANT_ID = os.getenv("SERVICE_TITAN_TENANT_ID")
+mcp = FastMCP("ServiceTitan Memberships", lifespan=client_lifespan)
 
-# OAuth + API URLs
-TOKEN_URL = "https://auth.servicetitan.io/connect/token"
+# API URL
 BASE_URL = f"https://api.servicetitan.io/memberships/v2/tenant/{TENANT_ID}"
 
-async def get_access_token() -> str:
-    """Fetch OAuth2 access token from ServiceTitan."""
-    if not CLIENT_ID or not CLIENT_SECRET or not APP_KEY or not TENANT_ID:
-        error_msg = "ERROR_ENV: One or more ServiceTitan environment variables are not set."
-        raise ValueError(error_msg)
-
-    async with httpx.AsyncClient() as client:
-        headers = { "Content-Type": "application/x-www-form-urlencoded" }
-        data = {
-            "grant_type": "client_credentials",
-            "client_id": CLIENT_ID,
-            "client_secret": CLIENT_SECRET
-        }
-        response = await client.post(TOKEN_URL, data=data, headers=headers)
-        response.raise_for_status()
-        token_response_json = response.json()
-        
-        access_token = token_response_json.get("access_token")
-        
-        if not isinstance(access_token, str):
-            error_msg = f"ERROR_TOKEN: access_token is not a string or is missing. Type: {type(access_token)}, Value: {access_token}"
-            raise TypeError(error_msg)
-            
-        return access_token
-
-def clean_params(params: Dict[str, Any]) -> Dict[str, Any]:
-    """Remove None values from parameters"""
-    return {k: v for k, v in params.items() if v is not None}
+async def _request(
+    method: str,
+    path: str,
+    *,
+    params: Optional[Dict[str, Any]] = None,
+    json: Any = None,
+    not_found_msg: Optional[str] = None,
+    cache: bool = False,
+    none_on_404: bool = False
+) -> Any:
+    """
+    Make an authenticated request to the Memberships API.
 
-@mcp.tool()
-async def get_memberships(
-    page: Optional[int] = 1,
-    page_size: Optional[int] = 50,
-    include_total: Optional[bool] = False,
-    ids: Optional[str] = None,
-    created_before: Optional[str] = None,
-    created_on_or_after: Optional[str] = None,
-    modified_before: Optional[str] = None,
-    modified_on_or_after: Optional[str] = None,
-    sort: Optional[str] = None,
-    active: Optional[str] = None,
-    membership_type_ids: Optional[str] = None,
-    statuses: Optional[str] = None,
-    invoice_template_ids: Optional[str] = None,
-    location_ids: Optional[str] = None,
-    customer_ids: Optional[str] = None,
-    business_unit_ids: Optional[str] = None,
-    from_: Optional[str] = None,
-    to: Optional[str] = None,
-    duration_from: Optional[int] = None,
-    duration_to: Optional[int] = None,
-    billing_frequencies: Optional[str] = None
-) -> dict:
+    Returns {"error": not_found_msg} instead of raising when the API answers
+    404 and a not_found_msg is given, or None with none_on_404=True. With
+    cache=True, GET responses are reused for a short time (see
+    servicetitan_common.request).
     """
-    Retrieve memberships from ServiceTitan.
-    
-    Args:
-        page: Page number to return (starting from 1)
-        page_size: Number of records to return (50 by default)
-        include_total: Whether total count should be returned
-        ids: Lookup by multiple IDs (maximum 50)
-        created_before: Return items created before date/time (RFC3339 format)
-        created_on_or_after: Return items created on or after date/time (RFC3339 format)
-        modified_before: Return items modified before date/time (RFC3339 format)
-        modified_on_or_after: Return items modified on or after date/time (RFC3339 format)
-        sort: Sort by field (+FieldName for ascending, -FieldName for descending)
-        active: What kind of items should be returned ("True", "Any", "False")
-        membership_type_ids: Filter by membership type IDs
-        statuses: Filter by membership statuses
-        invoice_template_ids: Filter by invoice template IDs
-        location_ids: Filter by location IDs
-        customer_ids: Filter by customer IDs
-        business_unit_ids: Filter by business unit IDs
-        from_: Filter memberships from this date
-        to: Filter memberships to this date
-        duration_from: Filter by minimum duration
-        duration_to: Filter by maximum duration
-        billing_frequencies: Filter by billing frequencies
+    return await request(
+        BASE_URL, method, path,
+        params=params,
+        json_data=json,
+        cache=cache,
+        not_found_msg=not_found_msg,
+        none_on_404=none_on_404
+    )
+
+# Query arguments shared by the membership type, recurring service and event lists:
+# (argument, query parameter, type, default, description)
+_LIST_PARAMS = (
+    ("page", "page", Optional[int], 1, "Page number to return"),
+    ("page_size", "pageSize", Optional[int], 50, "Number of records to return"),
+    ("include_total", "includeTotal", Optional[bool], False, "Whether to include total count"),
+    ("ids", "ids", Optional[str], None, "Filter by specific IDs"),
+    ("created_before", "createdBefore", Optional[str], None, "Filter by creation date"),
+    ("created_on_or_after", "createdOnOrAfter", Optional[str], None, "Filter by creation date"),
+    ("modified_before", "modifiedBefore", Optional[str], None, "Filter by modification date"),
+    ("modified_on_or_after", "modifiedOnOrAfter", Optional[str], None, "Filter by modification date"),
+    ("sort", "sort", Optional[str], None, "Sort order")
+)
+
+_MEMBERSHIP_PARAMS = (
+    ("page", "page", Optional[int], 1, "Page number to return (starting from 1)"),
+    ("page_size", "pageSize", Optional[int], 50, "Number of records to return (50 by default)"),
+    ("include_total", "includeTotal", Optional[bool], False, "Whether total count should be returned"),
+    ("ids", "ids", Optional[str], None, "Lookup by multiple IDs (maximum 50)"),
+    ("created_before", "createdBefore", Optional[str], None, "Return items created before date/time (RFC3339 format)"),
+    ("created_on_or_after", "createdOnOrAfter", Optional[str], None, "Return items created on or after date/time (RFC3339 format)"),
+    ("modified_before", "modifiedBefore", Optional[str], None, "Return items modified before date/time (RFC3339 format)"),
+    ("modified_on_or_after", "modifiedOnOrAfter", Optional[str], None, "Return items modified on or after date/time (RFC3339 format)"),
+    ("sort", "sort", Optional[str], None, "Sort by field (+FieldName for ascending, -FieldName for descending)"),
+    ("active", "active", Optional[str], None, 'What kind of items should be returned ("True", "Any", "False")'),
+    ("membership_type_ids", "membershipTypeIds", Optional[str], None, "Filter by membership type IDs"),
+    ("statuses", "statuses", Optional[str], None, "Filter by membership statuses"),
+    ("invoice_template_ids", "invoiceTemplateIds", Optional[str], None, "Filter by invoice template IDs"),
+    ("location_ids", "locationIds", Optional[str], None, "Filter by location IDs"),
+    ("customer_ids", "customerIds", Optional[str], None, "Filter by customer IDs"),
+    ("business_unit_ids", "businessUnitIds", Optional[str], None, "Filter by business unit IDs"),
+    ("from_", "from", Optional[str], None, "Filter memberships from this date"),
+    ("to", "to", Optional[str], None, "Filter memberships to this date"),
+    ("duration_from", "durationFrom", Optional[int], None, "Filter by minimum duration"),
+    ("duration_to", "durationTo", Optional[int], None, "Filter by maximum duration"),
+    ("billing_frequencies", "billingFrequencies", Optional[str], None, "Filter by billing frequencies")
+)
+
+# Query parameter names for get_membership_status_changes, in the same order as its arguments
+_PAGING_KEYS = ("page", "pageSize", "includeTotal")
+
+# Body field names for update_membership, in the same order as its arguments
+_UPDATE_MEMBERSHIP_KEYS = ("from", "to", "duration", "durationType", "billingFrequency", "active", "externalData")
+
+# List tools: (tool name, path, summary, query arguments, 404 message, cache responses)
+LIST_ENDPOINTS = (
+    ("get_memberships", "/memberships", "Retrieve memberships from ServiceTitan.", _MEMBERSHIP_PARAMS, "Memberships not found", False),
+    ("get_membership_types", "/membership-types", "Get membership types.", _LIST_PARAMS + (
+        ("active", "active", Optional[str], None, "Filter by active status"),
+    ), None, True),
+    ("get_recurring_services", "/recurring-services", "Get recurring services.", _LIST_PARAMS + (
+        ("active", "active", Optional[str], None, "Filter by active status"),
+        ("membership_ids", "membershipIds", Optional[str], None, "Filter by membership IDs")
+    ), None, False),
+    ("get_recurring_service_events", "/recurring-service-events", "Get recurring service events.", _LIST_PARAMS + (
+        ("recurring_service_ids", "recurringServiceIds", Optional[str], None, "Filter by recurring service IDs"),
+        ("membership_ids", "membershipIds", Optional[str], None, "Filter by membership IDs"),
+        ("statuses", "statuses", Optional[str], None, "Filter by event statuses"),
+        ("from_", "from", Optional[str], None, "Filter events from date"),
+        ("to", "to", Optional[str], None, "Filter events to date")
+    ), None, False)
+)
+
+get_memberships, get_membership_types, get_recurring_services, get_recurring_service_events = (
+    mcp.tool()(make_list_tool(BASE_URL, name, path, summary, params, not_found_msg=not_found_msg, cache=cache))
+    for name, path, summary, params, not_found_msg, cache in LIST_ENDPOINTS
+)
+
+async def list_all_memberships(page_size: int = 500, **filters: Any) -> dict:
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY
-    }
+    Retrieve every membership matching the filters in one call.
 
-    url = f"{BASE_URL}/memberships"
+    The first page reports the total count, then the remaining pages are
+    requested concurrently instead of one get_memberships call per page.
+    Accepts the same filters as get_memberships. Pages that fail are listed
+    under "errors" (see servicetitan_common.fetch_all_pages).
 
-    params = {
-        "page": page,
-        "pageSize": page_size,
-        "includeTotal": include_total,
-        "ids": ids,
-        "createdBefore": created_before,
-        "createdOnOrAfter": created_on_or_after,
-        "modifiedBefore": modified_before,
-        "modifiedOnOrAfter": modified_on_or_after,
-        "sort": sort,
-        "active": active,
-        "membershipTypeIds": membership_type_ids,
-        "statuses": statuses,
-        "invoiceTemplateIds": invoice_template_ids,
-        "locationIds": location_ids,
-        "customerIds": customer_ids,
-        "businessUnitIds": business_unit_ids,
-        "from": from_,
-        "to": to,
-        "durationFrom": duration_from,
-        "durationTo": duration_to,
-        "billingFrequencies": billing_frequencies
-    }
-
-    clean_params_dict = clean_params(params)
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers, params=clean_params_dict)
-        if response.status_code == 404:
-            return {"error": "Memberships not found"}
-        response.raise_for_status()
-        return response.json()
+    Args:
+        page_size: Number of records to request per page
+    """
+    return await fetch_all_pages(
+        lambda page, include_total: get_memberships(
+            page=page, page_size=page_size, include_total=include_total, **filters
+        ),
+        page_size
+    )
+
+# Expose the get_memberships filters (everything but paging) as the tool's arguments
+list_all_memberships.__signature__ = inspect.Signature(
+    [inspect.Parameter("page_size", inspect.Parameter.KEYWORD_ONLY, default=500, annotation=int)] + [
+        inspect.Parameter(arg, inspect.Parameter.KEYWORD_ONLY, default=default, annotation=annotation)
+        for arg, _, annotation, default, _ in _MEMBERSHIP_PARAMS
+        if arg not in ("page", "page_size", "include_total")
+    ],
+    return_annotation=dict
+)
+mcp.tool()(list_all_memberships)
 
 @mcp.tool()
 async def get_membership_by_id(membership_id: str) -> dict:
@@ -153,20 +147,7 @@ async def get_membership_by_id(membership_id: str) -> dict:
     Args:
         membership_id: The ID of the membership to retrieve
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY
-    }
-
-    url = f"{BASE_URL}/memberships/{membership_id}"
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers)
-        if response.status_code == 404:
-            return {"error": "Membership not found"}
-        response.raise_for_status()
-        return response.json()
+    return await _request("GET", f"/memberships/{membership_id}", not_found_msg="Membership not found", cache=True)
 
 @mcp.tool()
 async def sell_membership(
@@ -204,15 +185,6 @@ async def sell_membership(
         active: Whether membership is active
         external_data: Additional external data
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY,
-        "Content-Type": "application/json"
-    }
-
-    url = f"{BASE_URL}/memberships"
-
     data = {
         "customerId": customer_id,
         "membershipTypeId": membership_type_id,
@@ -232,10 +204,7 @@ async def sell_membership(
     if external_data:
         data["externalData"] = external_data
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(url, headers=headers, json=data)
-        response.raise_for_status()
-        return response.json()
+    return await _request("POST", "/memberships", json=data)
 
 @mcp.tool()
 async def update_membership(
@@ -261,37 +230,14 @@ async def update_membership(
         active: New active status
         external_data: External data updates
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY,
-        "Content-Type": "application/json"
-    }
+    values = (from_, to, duration, duration_type, billing_frequency, active, external_data)
+    data = {k: v for k, v in zip(_UPDATE_MEMBERSHIP_KEYS, values) if v is not None}
 
-    url = f"{BASE_URL}/memberships/{membership_id}"
-
-    data = {}
-    if from_ is not None:
-        data["from"] = from_
-    if to is not None:
-        data["to"] = to
-    if duration is not None:
-        data["duration"] = duration
-    if duration_type is not None:
-        data["durationType"] = duration_type
-    if billing_frequency is not None:
-        data["billingFrequency"] = billing_frequency
-    if active is not None:
-        data["active"] = active
-    if external_data is not None:
-        data["externalData"] = external_data
-
-    async with httpx.AsyncClient() as client:
-        response = await client.patch(url, headers=headers, json=data)
-        if response.status_code == 404:
-            return {"error": "Membership not found"}
-        response.raise_for_status()
-        return response.json()
+    try:
+        return await _request("PATCH", f"/memberships/{membership_id}", json=data, not_found_msg="Membership not found")
+    finally:
+        # Don't let get_membership_by_id serve the pre-update membership from its cache
+        invalidate_cache(BASE_URL, f"/memberships/{membership_id}")
 
 @mcp.tool()
 async def get_membership_status_changes(
@@ -309,211 +255,10 @@ async def get_membership_status_changes(
         page_size: Number of records to return
         include_total: Whether to include total count
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY
-    }
-
-    url = f"{BASE_URL}/memberships/{membership_id}/status-changes"
-
-    params = {
-        "page": page,
-        "pageSize": page_size,
-        "includeTotal": include_total
-    }
-
-    clean_params_dict = clean_params(params)
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers, params=clean_params_dict)
-        if response.status_code == 404:
-            return {"error": "Membership not found"}
-        response.raise_for_status()
-        return response.json()
-
-@mcp.tool()
-async def get_membership_types(
-    page: Optional[int] = 1,
-    page_size: Optional[int] = 50,
-    include_total: Optional[bool] = False,
-    ids: Optional[str] = None,
-    created_before: Optional[str] = None,
-    created_on_or_after: Optional[str] = None,
-    modified_before: Optional[str] = None,
-    modified_on_or_after: Optional[str] = None,
-    sort: Optional[str] = None,
-    active: Optional[str] = None
-) -> dict:
-    """
-    Get membership types.
-    
-    Args:
-        page: Page number to return
-        page_size: Number of records to return
-        include_total: Whether to include total count
-        ids: Filter by specific IDs
-        created_before: Filter by creation date
-        created_on_or_after: Filter by creation date
-        modified_before: Filter by modification date
-        modified_on_or_after: Filter by modification date
-        sort: Sort order
-        active: Filter by active status
-    """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY
-    }
-
-    url = f"{BASE_URL}/membership-types"
+    values = (page, page_size, include_total)
+    params = {k: v for k, v in zip(_PAGING_KEYS, values) if v is not None}
 
-    params = {
-        "page": page,
-        "pageSize": page_size,
-        "includeTotal": include_total,
-        "ids": ids,
-        "createdBefore": created_before,
-        "createdOnOrAfter": created_on_or_after,
-        "modifiedBefore": modified_before,
-        "modifiedOnOrAfter": modified_on_or_after,
-        "sort": sort,
-        "active": active
-    }
-
-    clean_params_dict = clean_params(params)
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers, params=clean_params_dict)
-        response.raise_for_status()
-        return response.json()
-
-@mcp.tool()
-async def get_recurring_services(
-    page: Optional[int] = 1,
-    page_size: Optional[int] = 50,
-    include_total: Optional[bool] = False,
-    ids: Optional[str] = None,
-    created_before: Optional[str] = None,
-    created_on_or_after: Optional[str] = None,
-    modified_before: Optional[str] = None,
-    modified_on_or_after: Optional[str] = None,
-    sort: Optional[str] = None,
-    active: Optional[str] = None,
-    membership_ids: Optional[str] = None
-) -> dict:
-    """
-    Get recurring services.
-    
-    Args:
-        page: Page number to return
-        page_size: Number of records to return
-        include_total: Whether to include total count
-        ids: Filter by specific IDs
-        created_before: Filter by creation date
-        created_on_or_after: Filter by creation date
-        modified_before: Filter by modification date
-        modified_on_or_after: Filter by modification date
-        sort: Sort order
-        active: Filter by active status
-        membership_ids: Filter by membership IDs
-    """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY
-    }
-
-    url = f"{BASE_URL}/recurring-services"
-
-    params = {
-        "page": page,
-        "pageSize": page_size,
-        "includeTotal": include_total,
-        "ids": ids,
-        "createdBefore": created_before,
-        "createdOnOrAfter": created_on_or_after,
-        "modifiedBefore": modified_before,
-        "modifiedOnOrAfter": modified_on_or_after,
-        "sort": sort,
-        "active": active,
-        "membershipIds": membership_ids
-    }
-
-    clean_params_dict = clean_params(params)
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers, params=clean_params_dict)
-        response.raise_for_status()
-        return response.json()
-
-@mcp.tool()
-async def get_recurring_service_events(
-    page: Optional[int] = 1,
-    page_size: Optional[int] = 50,
-    include_total: Optional[bool] = False,
-    ids: Optional[str] = None,
-    created_before: Optional[str] = None,
-    created_on_or_after: Optional[str] = None,
-    modified_before: Optional[str] = None,
-    modified_on_or_after: Optional[str] = None,
-    sort: Optional[str] = None,
-    recurring_service_ids: Optional[str] = None,
-    membership_ids: Optional[str] = None,
-    statuses: Optional[str] = None,
-    from_: Optional[str] = None,
-    to: Optional[str] = None
-) -> dict:
-    """
-    Get recurring service events.
-    
-    Args:
-        page: Page number to return
-        page_size: Number of records to return
-        include_total: Whether to include total count
-        ids: Filter by specific IDs
-        created_before: Filter by creation date
-        created_on_or_after: Filter by creation date
-        modified_before: Filter by modification date
-        modified_on_or_after: Filter by modification date
-        sort: Sort order
-        recurring_service_ids: Filter by recurring service IDs
-        membership_ids: Filter by membership IDs
-        statuses: Filter by event statuses
-        from_: Filter events from date
-        to: Filter events to date
-    """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY
-    }
-
-    url = f"{BASE_URL}/recurring-service-events"
-
-    params = {
-        "page": page,
-        "pageSize": page_size,
-        "includeTotal": include_total,
-        "ids": ids,
-        "createdBefore": created_before,
-        "createdOnOrAfter": created_on_or_after,
-        "modifiedBefore": modified_before,
-        "modifiedOnOrAfter": modified_on_or_after,
-        "sort": sort,
-        "recurringServiceIds": recurring_service_ids,
-        "membershipIds": membership_ids,
-        "statuses": statuses,
-        "from": from_,
-        "to": to
-    }
-
-    clean_params_dict = clean_params(params)
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers, params=clean_params_dict)
-        response.raise_for_status()
-        return response.json()
+    return await _request("GET", f"/memberships/{membership_id}/status-changes", params=params, not_found_msg="Membership not found")
 
 @mcp.tool()
 async def mark_recurring_service_event_complete(event_id: str) -> dict:
@@ -523,20 +268,10 @@ async def mark_recurring_service_event_complete(event_id: str) -> dict:
     Args:
         event_id: ID of the event to mark complete
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY
-    }
-
-    url = f"{BASE_URL}/recurring-service-events/{event_id}/mark-complete"
-
-    async with httpx.AsyncClient() as client:
-        response = await client.post(url, headers=headers)
-        if response.status_code == 404:
-            return {"error": "Recurring service event not found"}
-        response.raise_for_status()
-        return {"message": "Event marked as complete"}
+    result = await _request("POST", f"/recurring-service-events/{event_id}/mark-complete", none_on_404=True)
+    if result is None:
+        return {"error": "Recurring service event not found"}
+    return {"message": "Event marked as complete"}
 
 @mcp.tool()
 async def mark_recurring_service_event_incomplete(event_id: str) -> dict:
@@ -546,84 +281,32 @@ async def mark_recurring_service_event_incomplete(event_id: str) -> dict:
     Args:
         event_id: ID of the event to mark incomplete
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY
-    }
-
-    url = f"{BASE_URL}/recurring-service-events/{event_id}/mark-incomplete"
-
-    async with httpx.AsyncClient() as client:
-        response = await client.post(url, headers=headers)
-        if response.status_code == 404:
-            return {"error": "Recurring service event not found"}
-        response.raise_for_status()
-        return {"message": "Event marked as incomplete"}
+    result = await _request("POST", f"/recurring-service-events/{event_id}/mark-incomplete", none_on_404=True)
+    if result is None:
+        return {"error": "Recurring service event not found"}
+    return {"message": "Event marked as incomplete"}
 
 @mcp.tool()
 async def export_memberships() -> dict:
     """Export memberships data."""
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY
-    }
-
-    url = f"{BASE_URL}/export/memberships"
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers)
-        response.raise_for_status()
-        return response.json()
+    return await fetch_streamed(BASE_URL, "/export/memberships")
 
 @mcp.tool()
 async def export_membership_types() -> dict:
     """Export membership types data."""
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY
-    }
-
-    url = f"{BASE_URL}/export/membership-types"
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers)
-        response.raise_for_status()
-        return response.json()
+    return await fetch_streamed(BASE_URL, "/export/membership-types")
 
 @mcp.tool()
 async def export_recurring_services() -> dict:
     """Export recurring services data."""
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY
-    }
-
-    url = f"{BASE_URL}/export/recurring-services"
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers)
-        response.raise_for_status()
-        return response.json()
+    return await fetch_streamed(BASE_URL, "/export/recurring-services")
 
 @mcp.tool()
 async def export_recurring_service_events() -> dict:
     """Export recurring service events data."""
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY
-    }
-
-    url = f"{BASE_URL}/export/recurring-service-events"
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers)
-        response.raise_for_status()
-        return response.json()
+    return await fetch_streamed(BASE_URL, "/export/recurring-service-events")
 
 if __name__ == "__main__":
+    # Configure logging only when run as a server, not when imported
+    logging.basicConfig(level=logging.INFO)
     mcp.run(transport="stdio") 
\ No newline at end of file
@@ -1,43 +1,90 @@
 from mcp.server.fastmcp import FastMCP
-from dotenv import load_dotenv
-import os
-import httpx
-from typing import Optional, List
-
-# Load .env values
-load_dotenv()
-
-# Env vars
-CLIENT_ID = os.getenv("SERVICE_TITAN_CLIENT_ID")
-CLIENT_SECRET = os.getenv("SERVICE_TITAN_CLIENT_SECRET")
-APP_KEY = os.getenv("SERVICE_TITAN_APP_KEY")
-TENANT_ID = os.getenv("SERVICE_TITAN_TENANT_ID")
-
-# OAuth + API URLs
-TOKEN_URL = "https://auth.servicetitan.io/connect/token"
+import asyncio
+from datetime import datetime, timezone
+from typing import Optional, List, Dict, Any, Awaitable, Iterable
+from servicetitan_common import (
+    TENANT_ID, fetch_all_pages, fetch_streamed, install_event_loop, invalidate_cache, make_list_tool, request,
+    warmup_lifespan
+)
+
+# API URL
 PAYROLL_BASE_URL = "https://api.servicetitan.io/payroll/v2"
 
-# FastMCP instance for Payroll v2 API
-mcp = FastMCP("servicetitan-payroll")
+# Tenant-scoped base URL for every payroll endpoint
+BASE_URL = f"{PAYROLL_BASE_URL}/tenant/{TENANT_ID}"
 
-async def get_access_token() -> str:
-    """Fetch OAuth2 access token from ServiceTitan."""
-    if not CLIENT_ID or not CLIENT_SECRET or not APP_KEY or not TENANT_ID:
-        error_msg = "ERROR_ENV: One or more ServiceTitan environment variables are not set."
-        raise Exception(error_msg)
-    
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            TOKEN_URL,
-            data={
-                "grant_type": "client_credentials",
-                "client_id": CLIENT_ID,
-                "client_secret": CLIENT_SECRET
-            },
-            headers={"Content-Type": "application/x-www-form-urlencoded"}
-        )
-        response.raise_for_status()
-        return response.json()["access_token"]
+# FastMCP instance for Payroll v2 API
+# Warm the connection with the cheapest list call so the first tool call skips the handshakes
+mcp = FastMCP("servicetitan-payroll", lifespan=warmup_lifespan(BASE_URL, "/timesheet-codes", {"pageSize": 1}))
+
+async def _request(
+    method: str,
+    path: str,
+    *,
+    params: Optional[Dict[str, Any]] = None,
+    json: Any = None,
+    cache: bool = False
+) -> Any:
+    """
+    Make an authenticated request to the Payroll API and return the decoded JSON body.
+
+    With cache=True, GET responses are reused for a short time (see servicetitan_common.request).
+    """
+    return await request(BASE_URL, method, path, params=params, json_data=json, cache=cache)
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    """
+    Format a datetime filter as an RFC3339 UTC timestamp with a Z suffix.
+
+    Aware values are converted to UTC; naive values are taken to already be UTC.
+    """
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+
+async def _gather_results(calls: Iterable[Awaitable[Any]]) -> dict:
+    """
+    Run the calls concurrently (bounded by the shared client's concurrency limit).
+
+    Returns {"results": [...], "errors": [...]}: results is in the same order as
+    the calls with None for a failed call, and each error carries the call's index.
+    """
+    responses = await asyncio.gather(*calls, return_exceptions=True)
+
+    results = []
+    errors = []
+    for index, response in enumerate(responses):
+        if isinstance(response, Exception):
+            results.append(None)
+            errors.append({"index": index, "error": "Request failed", "message": str(response)})
+        else:
+            results.append(response)
+    return {"results": results, "errors": errors}
+
+async def _bulk_post(path: str, items: List[Dict[str, Any]]) -> dict:
+    """POST every item to `path` concurrently; returns the same shape as _gather_results."""
+    return await _gather_results(_request("POST", path, json=item) for item in items)
+
+# Query arguments shared by the timesheet list tools:
+# (argument, query parameter, type, default, description)
+_PAGING_PARAMS = (
+    ("page", "page", Optional[int], None, "Page number to return (starting from 1)"),
+    ("page_size", "pageSize", Optional[int], None, "Number of records to return (50 by default)"),
+    ("include_total", "includeTotal", Optional[bool], None, "Whether total count should be returned")
+)
+
+_CHANGED_PARAMS = (
+    ("created_before", "createdBefore", Optional[datetime], None, "Return items created before date/time"),
+    ("created_on_or_after", "createdOnOrAfter", Optional[datetime], None, "Return items created on or after date/time"),
+    ("modified_before", "modifiedBefore", Optional[datetime], None, "Return items modified before date/time"),
+    ("modified_on_or_after", "modifiedOnOrAfter", Optional[datetime], None, "Return items modified on or after date/time")
+)
+
+def _query_value(value: Any) -> Any:
+    """Convert a list tool argument to its query string form (datetimes as UTC timestamps)."""
+    return _iso(value) if isinstance(value, datetime) else value
 
 # EXPORT ENDPOINTS
 
@@ -47,23 +94,12 @@ async def export_job_splits(
     include_recent_changes: Optional[bool] = None
 ) -> dict:
     """Provides export feed for job splits."""
-    access_token = await get_access_token()
-    
-    params = {}
-    if from_token is not None: params["from"] = from_token
-    if include_recent_changes is not None: params["includeRecentChanges"] = include_recent_changes
+    params = {k: v for k, v in (
+        ("from", from_token),
+        ("includeRecentChanges", include_recent_changes)
+    ) if v is not None}
     
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{PAYROLL_BASE_URL}/tenant/{TENANT_ID}/export/jobs/splits",
-            params=params,
-            headers={
-                "Authorization": f"Bearer {access_token}",
-                "ST-App-Key": APP_KEY
-            }
-        )
-        response.raise_for_status()
-        return response.json()
+    return await fetch_streamed(BASE_URL, "/export/jobs/splits", params)
 
 @mcp.tool()
 async def export_payroll_adjustments(
@@ -71,23 +107,12 @@ async def export_payroll_adjustments(
     include_recent_changes: Optional[bool] = None
 ) -> dict:
     """Provides export feed for payroll adjustments."""
-    access_token = await get_access_token()
+    params = {k: v for k, v in (
+        ("from", from_token),
+        ("includeRecentChanges", include_recent_changes)
+    ) if v is not None}
     
-    params = {}
-    if from_token is not None: params["from"] = from_token
-    if include_recent_changes is not None: params["includeRecentChanges"] = include_recent_changes
-    
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{PAYROLL_BASE_URL}/tenant/{TENANT_ID}/export/payroll-adjustments",
-            params=params,
-            headers={
-                "Authorization": f"Bearer {access_token}",
-                "ST-App-Key": APP_KEY
-            }
-        )
-        response.raise_for_status()
-        return response.json()
+    return await fetch_streamed(BASE_URL, "/export/payroll-adjustments", params)
 
 @mcp.tool()
 async def export_job_timesheets(
@@ -95,23 +120,12 @@ async def export_job_timesheets(
     include_recent_changes: Optional[bool] = None
 ) -> dict:
     """Provides export feed for job timesheets."""
-    access_token = await get_access_token()
-    
-    params = {}
-    if from_token is not None: params["from"] = from_token
-    if include_recent_changes is not None: params["includeRecentChanges"] = include_recent_changes
+    params = {k: v for k, v in (
+        ("from", from_token),
+        ("includeRecentChanges", include_recent_changes)
+    ) if v is not None}
     
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{PAYROLL_BASE_URL}/tenant/{TENANT_ID}/export/jobs/timesheets",
-            params=params,
-            headers={
-                "Authorization": f"Bearer {access_token}",
-                "ST-App-Key": APP_KEY
-            }
-        )
-        response.raise_for_status()
-        return response.json()
+    return await fetch_streamed(BASE_URL, "/export/jobs/timesheets", params)
 
 @mcp.tool()
 async def export_activity_codes(
@@ -119,23 +133,12 @@ async def export_activity_codes(
     include_recent_changes: Optional[bool] = None
 ) -> dict:
     """Provides export feed for activity codes."""
-    access_token = await get_access_token()
-    
-    params = {}
-    if from_token is not None: params["from"] = from_token
-    if include_recent_changes is not None: params["includeRecentChanges"] = include_recent_changes
+    params = {k: v for k, v in (
+        ("from", from_token),
+        ("includeRecentChanges", include_recent_changes)
+    ) if v is not None}
     
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{PAYROLL_BASE_URL}/tenant/{TENANT_ID}/export/activity-codes",
-            params=params,
-            headers={
-                "Authorization": f"Bearer {access_token}",
-                "ST-App-Key": APP_KEY
-            }
-        )
-        response.raise_for_status()
-        return response.json()
+    return await fetch_streamed(BASE_URL, "/export/activity-codes", params)
 
 @mcp.tool()
 async def export_timesheet_codes(
@@ -143,23 +146,12 @@ async def export_timesheet_codes(
     include_recent_changes: Optional[bool] = None
 ) -> dict:
     """Provides export feed for timesheet codes."""
-    access_token = await get_access_token()
+    params = {k: v for k, v in (
+        ("from", from_token),
+        ("includeRecentChanges", include_recent_changes)
+    ) if v is not None}
     
-    params = {}
-    if from_token is not None: params["from"] = from_token
-    if include_recent_changes is not None: params["includeRecentChanges"] = include_recent_changes
-    
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{PAYROLL_BASE_URL}/tenant/{TENANT_ID}/export/timesheet-codes",
-            params=params,
-            headers={
-                "Authorization": f"Bearer {access_token}",
-                "ST-App-Key": APP_KEY
-            }
-        )
-        response.raise_for_status()
-        return response.json()
+    return await fetch_streamed(BASE_URL, "/export/timesheet-codes", params)
 
 @mcp.tool()
 async def export_gross_pay_items(
@@ -167,23 +159,12 @@ async def export_gross_pay_items(
     include_recent_changes: Optional[bool] = None
 ) -> dict:
     """Provides export feed for gross pay items."""
-    access_token = await get_access_token()
-    
-    params = {}
-    if from_token is not None: params["from"] = from_token
-    if include_recent_changes is not None: params["includeRecentChanges"] = include_recent_changes
+    params = {k: v for k, v in (
+        ("from", from_token),
+        ("includeRecentChanges", include_recent_changes)
+    ) if v is not None}
     
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{PAYROLL_BASE_URL}/tenant/{TENANT_ID}/export/gross-pay-items",
-            params=params,
-            headers={
-                "Authorization": f"Bearer {access_token}",
-                "ST-App-Key": APP_KEY
-            }
-        )
-        response.raise_for_status()
-        return response.json()
+    return await fetch_streamed(BASE_URL, "/export/gross-pay-items", params)
 
 @mcp.tool()
 async def export_payroll_settings(
@@ -191,23 +172,50 @@ async def export_payroll_settings(
     include_recent_changes: Optional[bool] = None
 ) -> dict:
     """Provides export feed for payroll settings."""
-    access_token = await get_access_token()
-    
-    params = {}
-    if from_token is not None: params["from"] = from_token
-    if include_recent_changes is not None: params["includeRecentChanges"] = include_recent_changes
-    
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{PAYROLL_BASE_URL}/tenant/{TENANT_ID}/export/payroll-settings",
-            params=params,
-            headers={
-                "Authorization": f"Bearer {access_token}",
-                "ST-App-Key": APP_KEY
-            }
-        )
-        response.raise_for_status()
-        return response.json()
+    params = {k: v for k, v in (
+        ("from", from_token),
+        ("includeRecentChanges", include_recent_changes)
+    ) if v is not None}
+    
+    return await fetch_streamed(BASE_URL, "/export/payroll-settings", params)
+
+# Export feed name -> exporter, used by export_all
+EXPORTERS = {
+    "job_splits": export_job_splits,
+    "payroll_adjustments": export_payroll_adjustments,
+    "job_timesheets": export_job_timesheets,
+    "activity_codes": export_activity_codes,
+    "timesheet_codes": export_timesheet_codes,
+    "gross_pay_items": export_gross_pay_items,
+    "payroll_settings": export_payroll_settings
+}
+
+@mcp.tool()
+async def export_all(
+    from_tokens: Optional[Dict[str, str]] = None,
+    include_recent_changes: Optional[bool] = None
+) -> dict:
+    """
+    Fetches all seven payroll export feeds concurrently.
+
+    Args:
+        from_tokens: Continuation token per feed, keyed by feed name (job_splits,
+            payroll_adjustments, job_timesheets, activity_codes, timesheet_codes,
+            gross_pay_items, payroll_settings)
+        include_recent_changes: Passed to every feed
+
+    Returns a dict keyed by feed name; a feed that failed holds an "error" key.
+    """
+    from_tokens = from_tokens or {}
+    results = await asyncio.gather(
+        *(exporter(from_tokens.get(name), include_recent_changes) for name, exporter in EXPORTERS.items()),
+        return_exceptions=True
+    )
+
+    return {
+        name: {"error": "Request failed", "message": str(result)} if isinstance(result, Exception) else result
+        for name, result in zip(EXPORTERS, results)
+    }
 
 # GROSS PAY ITEMS ENDPOINTS
 
@@ -221,28 +229,32 @@ async def create_gross_pay_item(
     memo: Optional[str] = None
 ) -> dict:
     """Creates new gross pay item."""
-    access_token = await get_access_token()
-    
     body = {
         "payrollId": payroll_id,
         "amount": amount,
         "activityCodeId": activity_code_id,
         "date": date
     }
-    if invoice_id is not None: body["invoiceId"] = invoice_id
-    if memo is not None: body["memo"] = memo
+    body.update((k, v) for k, v in (
+        ("invoiceId", invoice_id),
+        ("memo", memo)
+    ) if v is not None)
     
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            f"{PAYROLL_BASE_URL}/tenant/{TENANT_ID}/gross-pay-items",
-            json=body,
-            headers={
-                "Authorization": f"Bearer {access_token}",
-                "ST-App-Key": APP_KEY
-            }
-        )
-        response.raise_for_status()
-        return response.json()
+    return await _request("POST", "/gross-pay-items", json=body)
+
+@mcp.tool()
+async def bulk_create_gross_pay_items(items: List[Dict[str, Any]]) -> dict:
+    """
+    Creates many gross pay items concurrently.
+
+    Args:
+        items: Gross pay item bodies as sent by create_gross_pay_item (payrollId,
+            amount, activityCodeId, date, and optionally invoiceId and memo)
+
+    Returns {"results": [...], "errors": [...]}; results follow the order of items
+    (None where the item failed) and each error holds the failed item's index.
+    """
+    return await _bulk_post("/gross-pay-items", items)
 
 @mcp.tool()
 async def get_gross_pay_items(
@@ -258,31 +270,20 @@ async def get_gross_pay_items(
     modified_on_or_before: Optional[str] = None
 ) -> dict:
     """Gets a list of gross pay items."""
-    access_token = await get_access_token()
-    
-    params = {}
-    if page is not None: params["page"] = page
-    if page_size is not None: params["pageSize"] = page_size
-    if include_total is not None: params["includeTotal"] = include_total
-    if employee_type is not None: params["employeeType"] = employee_type
-    if employee_id is not None: params["employeeId"] = employee_id
-    if payroll_ids is not None: params["payrollIds"] = payroll_ids
-    if date_on_or_after is not None: params["dateOnOrAfter"] = date_on_or_after
-    if date_on_or_before is not None: params["dateOnOrBefore"] = date_on_or_before
-    if modified_on_or_after is not None: params["modifiedOnOrAfter"] = modified_on_or_after
-    if modified_on_or_before is not None: params["modifiedOnOrBefore"] = modified_on_or_before
-    
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{PAYROLL_BASE_URL}/tenant/{TENANT_ID}/gross-pay-items",
-            params=params,
-            headers={
-                "Authorization": f"Bearer {access_token}",
-                "ST-App-Key": APP_KEY
-            }
-        )
-        response.raise_for_status()
-        return response.json()
+    params = {k: v for k, v in (
+        ("page", page),
+        ("pageSize", page_size),
+        ("includeTotal", include_total),
+        ("employeeType", employee_type),
+        ("employeeId", employee_id),
+        ("payrollIds", payroll_ids),
+        ("dateOnOrAfter", date_on_or_after),
+        ("dateOnOrBefore", date_on_or_before),
+        ("modifiedOnOrAfter", modified_on_or_after),
+        ("modifiedOnOrBefore", modified_on_or_before)
+    ) if v is not None}
+    
+    return await _request("GET", "/gross-pay-items", params=params)
 
 @mcp.tool()
 async def update_gross_pay_item(
@@ -295,44 +296,24 @@ async def update_gross_pay_item(
     memo: Optional[str] = None
 ) -> dict:
     """Update specified gross pay item."""
-    access_token = await get_access_token()
-    
     body = {
         "payrollId": payroll_id,
         "amount": amount,
         "activityCodeId": activity_code_id,
         "date": date
     }
-    if invoice_id is not None: body["invoiceId"] = invoice_id
-    if memo is not None: body["memo"] = memo
+    body.update((k, v) for k, v in (
+        ("invoiceId", invoice_id),
+        ("memo", memo)
+    ) if v is not None)
     
-    async with httpx.AsyncClient() as client:
-        response = await client.put(
-            f"{PAYROLL_BASE_URL}/tenant/{TENANT_ID}/gross-pay-items/{item_id}",
-            json=body,
-            headers={
-                "Authorization": f"Bearer {access_token}",
-                "ST-App-Key": APP_KEY
-            }
-        )
-        response.raise_for_status()
-        return response.json()
+    return await _request("PUT", f"/gross-pay-items/{item_id}", json=body)
 
 @mcp.tool()
 async def delete_gross_pay_item(item_id: int) -> dict:
     """Delete specified gross pay item."""
-    access_token = await get_access_token()
-    
-    async with httpx.AsyncClient() as client:
-        response = await client.delete(
-            f"{PAYROLL_BASE_URL}/tenant/{TENANT_ID}/gross-pay-items/{item_id}",
-            headers={
-                "Authorization": f"Bearer {access_token}",
-                "ST-App-Key": APP_KEY
-            }
-        )
-        response.raise_for_status()
-        return {"success": True}
+    await _request("DELETE", f"/gross-pay-items/{item_id}")
+    return {"success": True}
 
 # JOB SPLITS ENDPOINTS
 
@@ -350,30 +331,19 @@ async def get_job_splits(
     sort: Optional[str] = None
 ) -> dict:
     """Gets a list of job splits."""
-    access_token = await get_access_token()
-    
-    params = {}
-    if page is not None: params["page"] = page
-    if page_size is not None: params["pageSize"] = page_size
-    if include_total is not None: params["includeTotal"] = include_total
-    if created_on_or_after is not None: params["createdOnOrAfter"] = created_on_or_after
-    if created_before is not None: params["createdBefore"] = created_before
-    if modified_on_or_after is not None: params["modifiedOnOrAfter"] = modified_on_or_after
-    if modified_before is not None: params["modifiedBefore"] = modified_before
-    if active is not None: params["active"] = active
-    if sort is not None: params["sort"] = sort
+    params = {k: v for k, v in (
+        ("page", page),
+        ("pageSize", page_size),
+        ("includeTotal", include_total),
+        ("createdOnOrAfter", created_on_or_after),
+        ("createdBefore", created_before),
+        ("modifiedOnOrAfter", modified_on_or_after),
+        ("modifiedBefore", modified_before),
+        ("active", active),
+        ("sort", sort)
+    ) if v is not None}
     
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{PAYROLL_BASE_URL}/tenant/{TENANT_ID}/jobs/{job_id}/splits",
-            params=params,
-            headers={
-                "Authorization": f"Bearer {access_token}",
-                "ST-App-Key": APP_KEY
-            }
-        )
-        response.raise_for_status()
-        return response.json()
+    return await _request("GET", f"/jobs/{job_id}/splits", params=params)
 
 @mcp.tool()
 async def get_job_splits_by_multiple_jobs(
@@ -389,31 +359,20 @@ async def get_job_splits_by_multiple_jobs(
     sort: Optional[str] = None
 ) -> dict:
     """Gets a list of job splits by multiple jobs."""
-    access_token = await get_access_token()
-    
-    params = {}
-    if job_ids is not None: params["jobIds"] = job_ids
-    if page is not None: params["page"] = page
-    if page_size is not None: params["pageSize"] = page_size
-    if include_total is not None: params["includeTotal"] = include_total
-    if created_on_or_after is not None: params["createdOnOrAfter"] = created_on_or_after
-    if created_before is not None: params["createdBefore"] = created_before
-    if modified_on_or_after is not None: params["modifiedOnOrAfter"] = modified_on_or_after
-    if modified_before is not None: params["modifiedBefore"] = modified_before
-    if active is not None: params["active"] = active
-    if sort is not None: params["sort"] = sort
-    
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{PAYROLL_BASE_URL}/tenant/{TENANT_ID}/jobs/splits",
-            params=params,
-            headers={
-                "Authorization": f"Bearer {access_token}",
-                "ST-App-Key": APP_KEY
-            }
-        )
-        response.raise_for_status()
-        return response.json()
+    params = {k: v for k, v in (
+        ("jobIds", job_ids),
+        ("page", page),
+        ("pageSize", page_size),
+        ("includeTotal", include_total),
+        ("createdOnOrAfter", created_on_or_after),
+        ("createdBefore", created_before),
+        ("modifiedOnOrAfter", modified_on_or_after),
+        ("modifiedBefore", modified_before),
+        ("active", active),
+        ("sort", sort)
+    ) if v is not None}
+    
+    return await _request("GET", "/jobs/splits", params=params)
 
 # LOCATION RATES ENDPOINTS
 
@@ -429,29 +388,18 @@ async def get_location_rates(
     sort: Optional[str] = None
 ) -> dict:
     """Gets a list of location hourly rates by multiple locations."""
-    access_token = await get_access_token()
-    
-    params = {}
-    if location_ids is not None: params["locationIds"] = location_ids
-    if created_before is not None: params["createdBefore"] = created_before
-    if created_on_or_after is not None: params["createdOnOrAfter"] = created_on_or_after
-    if page is not None: params["page"] = page
-    if page_size is not None: params["pageSize"] = page_size
-    if include_total is not None: params["includeTotal"] = include_total
-    if active is not None: params["active"] = active
-    if sort is not None: params["sort"] = sort
-    
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{PAYROLL_BASE_URL}/tenant/{TENANT_ID}/locations/rates",
-            params=params,
-            headers={
-                "Authorization": f"Bearer {access_token}",
-                "ST-App-Key": APP_KEY
-            }
-        )
-        response.raise_for_status()
-        return response.json()
+    params = {k: v for k, v in (
+        ("locationIds", location_ids),
+        ("createdBefore", created_before),
+        ("createdOnOrAfter", created_on_or_after),
+        ("page", page),
+        ("pageSize", page_size),
+        ("includeTotal", include_total),
+        ("active", active),
+        ("sort", sort)
+    ) if v is not None}
+    
+    return await _request("GET", "/locations/rates", params=params)
 
 # ACTIVITY CODES ENDPOINTS
 
@@ -462,40 +410,18 @@ async def get_activity_codes(
     include_total: Optional[bool] = None
 ) -> dict:
     """Gets a list of payroll activity codes."""
-    access_token = await get_access_token()
-    
-    params = {}
-    if page is not None: params["page"] = page
-    if page_size is not None: params["pageSize"] = page_size
-    if include_total is not None: params["includeTotal"] = include_total
+    params = {k: v for k, v in (
+        ("page", page),
+        ("pageSize", page_size),
+        ("includeTotal", include_total)
+    ) if v is not None}
     
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{PAYROLL_BASE_URL}/tenant/{TENANT_ID}/activity-codes",
-            params=params,
-            headers={
-                "Authorization": f"Bearer {access_token}",
-                "ST-App-Key": APP_KEY
-            }
-        )
-        response.raise_for_status()
-        return response.json()
+    return await _request("GET", "/activity-codes", params=params)
 
 @mcp.tool()
 async def get_activity_code_by_id(activity_code_id: int) -> dict:
     """Gets payroll activity code specified by ID."""
-    access_token = await get_access_token()
-    
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{PAYROLL_BASE_URL}/tenant/{TENANT_ID}/activity-codes/{activity_code_id}",
-            headers={
-                "Authorization": f"Bearer {access_token}",
-                "ST-App-Key": APP_KEY
-            }
-        )
-        response.raise_for_status()
-        return response.json()
+    return await _request("GET", f"/activity-codes/{activity_code_id}")
 
 # PAYROLL ADJUSTMENTS ENDPOINTS
 
@@ -512,8 +438,6 @@ async def create_payroll_adjustment(
     rate: Optional[float] = None
 ) -> dict:
     """Creates new payroll adjustment."""
-    access_token = await get_access_token()
-    
     body = {
         "employeeType": employee_type,
         "employeeId": employee_id,
@@ -522,21 +446,28 @@ async def create_payroll_adjustment(
         "memo": memo,
         "activityCodeId": activity_code_id
     }
-    if invoice_id is not None: body["invoiceId"] = invoice_id
-    if hours is not None: body["hours"] = hours
-    if rate is not None: body["rate"] = rate
+    body.update((k, v) for k, v in (
+        ("invoiceId", invoice_id),
+        ("hours", hours),
+        ("rate", rate)
+    ) if v is not None)
     
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            f"{PAYROLL_BASE_URL}/tenant/{TENANT_ID}/payroll-adjustments",
-            json=body,
-            headers={
-                "Authorization": f"Bearer {access_token}",
-                "ST-App-Key": APP_KEY
-            }
-        )
-        response.raise_for_status()
-        return response.json()
+    return await _request("POST", "/payroll-adjustments", json=body)
+
+@mcp.tool()
+async def bulk_create_payroll_adjustments(items: List[Dict[str, Any]]) -> dict:
+    """
+    Creates many payroll adjustments concurrently.
+
+    Args:
+        items: Payroll adjustment bodies as sent by create_payroll_adjustment
+            (employeeType, employeeId, postedOn, amount, memo, activityCodeId, and
+            optionally invoiceId, hours and rate)
+
+    Returns {"results": [...], "errors": [...]}; results follow the order of items
+    (None where the item failed) and each error holds the failed item's index.
+    """
+    return await _bulk_post("/payroll-adjustments", items)
 
 @mcp.tool()
 async def get_payroll_adjustments(
@@ -548,27 +479,16 @@ async def get_payroll_adjustments(
     posted_on_or_before: Optional[str] = None
 ) -> dict:
     """Gets a list of payroll adjustments."""
-    access_token = await get_access_token()
-    
-    params = {}
-    if page is not None: params["page"] = page
-    if page_size is not None: params["pageSize"] = page_size
-    if include_total is not None: params["includeTotal"] = include_total
-    if employee_ids is not None: params["employeeIds"] = employee_ids
-    if posted_on_or_after is not None: params["postedOnOrAfter"] = posted_on_or_after
-    if posted_on_or_before is not None: params["postedOnOrBefore"] = posted_on_or_before
+    params = {k: v for k, v in (
+        ("page", page),
+        ("pageSize", page_size),
+        ("includeTotal", include_total),
+        ("employeeIds", employee_ids),
+        ("postedOnOrAfter", posted_on_or_after),
+        ("postedOnOrBefore", posted_on_or_before)
+    ) if v is not None}
     
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{PAYROLL_BASE_URL}/tenant/{TENANT_ID}/payroll-adjustments",
-            params=params,
-            headers={
-                "Authorization": f"Bearer {access_token}",
-                "ST-App-Key": APP_KEY
-            }
-        )
-        response.raise_for_status()
-        return response.json()
+    return await _request("GET", "/payroll-adjustments", params=params)
 
 @mcp.tool()
 async def get_payroll_adjustment_by_id(
@@ -576,22 +496,11 @@ async def get_payroll_adjustment_by_id(
     employee_type: Optional[str] = None
 ) -> dict:
     """Gets payroll adjustment specified by ID."""
-    access_token = await get_access_token()
-    
-    params = {}
-    if employee_type is not None: params["employeeType"] = employee_type
+    params = {k: v for k, v in (
+        ("employeeType", employee_type),
+    ) if v is not None}
     
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{PAYROLL_BASE_URL}/tenant/{TENANT_ID}/payroll-adjustments/{adjustment_id}",
-            params=params,
-            headers={
-                "Authorization": f"Bearer {access_token}",
-                "ST-App-Key": APP_KEY
-            }
-        )
-        response.raise_for_status()
-        return response.json()
+    return await _request("GET", f"/payroll-adjustments/{adjustment_id}", params=params)
 
 # PAYROLLS ENDPOINTS
 
@@ -610,32 +519,21 @@ async def get_payrolls(
     active: Optional[str] = None
 ) -> dict:
     """Gets a list of payrolls."""
-    access_token = await get_access_token()
-    
-    params = {}
-    if employee_type is not None: params["employeeType"] = employee_type
-    if page is not None: params["page"] = page
-    if page_size is not None: params["pageSize"] = page_size
-    if include_total is not None: params["includeTotal"] = include_total
-    if started_on_or_after is not None: params["startedOnOrAfter"] = started_on_or_after
-    if ended_on_or_before is not None: params["endedOnOrBefore"] = ended_on_or_before
-    if modified_before is not None: params["modifiedBefore"] = modified_before
-    if modified_on_or_after is not None: params["modifiedOnOrAfter"] = modified_on_or_after
-    if approved_on_or_after is not None: params["approvedOnOrAfter"] = approved_on_or_after
-    if status is not None: params["status"] = status
-    if active is not None: params["active"] = active
-    
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{PAYROLL_BASE_URL}/tenant/{TENANT_ID}/payrolls",
-            params=params,
-            headers={
-                "Authorization": f"Bearer {access_token}",
-                "ST-App-Key": APP_KEY
-            }
-        )
-        response.raise_for_status()
-        return response.json()
+    params = {k: v for k, v in (
+        ("employeeType", employee_type),
+        ("page", page),
+        ("pageSize", page_size),
+        ("includeTotal", include_total),
+        ("startedOnOrAfter", started_on_or_after),
+        ("endedOnOrBefore", ended_on_or_before),
+        ("modifiedBefore", modified_before),
+        ("modifiedOnOrAfter", modified_on_or_after),
+        ("approvedOnOrAfter", approved_on_or_after),
+        ("status", status),
+        ("active", active)
+    ) if v is not None}
+    
+    return await _request("GET", "/payrolls", params=params)
 
 @mcp.tool()
 async def get_technician_payrolls(
@@ -652,31 +550,20 @@ async def get_technician_payrolls(
     active: Optional[str] = None
 ) -> dict:
     """Gets a list of technician payrolls."""
-    access_token = await get_access_token()
-    
-    params = {}
-    if page is not None: params["page"] = page
-    if page_size is not None: params["pageSize"] = page_size
-    if include_total is not None: params["includeTotal"] = include_total
-    if started_on_or_after is not None: params["startedOnOrAfter"] = started_on_or_after
-    if ended_on_or_before is not None: params["endedOnOrBefore"] = ended_on_or_before
-    if modified_before is not None: params["modifiedBefore"] = modified_before
-    if modified_on_or_after is not None: params["modifiedOnOrAfter"] = modified_on_or_after
-    if approved_on_or_after is not None: params["approvedOnOrAfter"] = approved_on_or_after
-    if status is not None: params["status"] = status
-    if active is not None: params["active"] = active
-    
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{PAYROLL_BASE_URL}/tenant/{TENANT_ID}/technicians/{technician_id}/payrolls",
-            params=params,
-            headers={
-                "Authorization": f"Bearer {access_token}",
-                "ST-App-Key": APP_KEY
-            }
-        )
-        response.raise_for_status()
-        return response.json()
+    params = {k: v for k, v in (
+        ("page", page),
+        ("pageSize", page_size),
+        ("includeTotal", include_total),
+        ("startedOnOrAfter", started_on_or_after),
+        ("endedOnOrBefore", ended_on_or_before),
+        ("modifiedBefore", modified_before),
+        ("modifiedOnOrAfter", modified_on_or_after),
+        ("approvedOnOrAfter", approved_on_or_after),
+        ("status", status),
+        ("active", active)
+    ) if v is not None}
+    
+    return await _request("GET", f"/technicians/{technician_id}/payrolls", params=params)
 
 @mcp.tool()
 async def get_employee_payrolls(
@@ -693,31 +580,20 @@ async def get_employee_payrolls(
     active: Optional[str] = None
 ) -> dict:
     """Gets a list of employee payrolls."""
-    access_token = await get_access_token()
-    
-    params = {}
-    if page is not None: params["page"] = page
-    if page_size is not None: params["pageSize"] = page_size
-    if include_total is not None: params["includeTotal"] = include_total
-    if started_on_or_after is not None: params["startedOnOrAfter"] = started_on_or_after
-    if ended_on_or_before is not None: params["endedOnOrBefore"] = ended_on_or_before
-    if modified_before is not None: params["modifiedBefore"] = modified_before
-    if modified_on_or_after is not None: params["modifiedOnOrAfter"] = modified_on_or_after
-    if approved_on_or_after is not None: params["approvedOnOrAfter"] = approved_on_or_after
-    if status is not None: params["status"] = status
-    if active is not None: params["active"] = active
-    
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{PAYROLL_BASE_URL}/tenant/{TENANT_ID}/employees/{employee_id}/payrolls",
-            params=params,
-            headers={
-                "Authorization": f"Bearer {access_token}",
-                "ST-App-Key": APP_KEY
-            }
-        )
-        response.raise_for_status()
-        return response.json()
+    params = {k: v for k, v in (
+        ("page", page),
+        ("pageSize", page_size),
+        ("includeTotal", include_total),
+        ("startedOnOrAfter", started_on_or_after),
+        ("endedOnOrBefore", ended_on_or_before),
+        ("modifiedBefore", modified_before),
+        ("modifiedOnOrAfter", modified_on_or_after),
+        ("approvedOnOrAfter", approved_on_or_after),
+        ("status", status),
+        ("active", active)
+    ) if v is not None}
+    
+    return await _request("GET", f"/employees/{employee_id}/payrolls", params=params)
 
 # PAYROLL SETTINGS ENDPOINTS
 
@@ -734,46 +610,24 @@ async def get_payroll_settings(
     active: Optional[str] = None
 ) -> dict:
     """Gets the payroll settings list."""
-    access_token = await get_access_token()
-    
-    params = {}
-    if employee_type is not None: params["employeeType"] = employee_type
-    if page is not None: params["page"] = page
-    if page_size is not None: params["pageSize"] = page_size
-    if include_total is not None: params["includeTotal"] = include_total
-    if created_before is not None: params["createdBefore"] = created_before
-    if created_on_or_after is not None: params["createdOnOrAfter"] = created_on_or_after
-    if modified_before is not None: params["modifiedBefore"] = modified_before
-    if modified_on_or_after is not None: params["modifiedOnOrAfter"] = modified_on_or_after
-    if active is not None: params["active"] = active
+    params = {k: v for k, v in (
+        ("employeeType", employee_type),
+        ("page", page),
+        ("pageSize", page_size),
+        ("includeTotal", include_total),
+        ("createdBefore", created_before),
+        ("createdOnOrAfter", created_on_or_after),
+        ("modifiedBefore", modified_before),
+        ("modifiedOnOrAfter", modified_on_or_after),
+        ("active", active)
+    ) if v is not None}
     
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{PAYROLL_BASE_URL}/tenant/{TENANT_ID}/payroll-settings",
-            params=params,
-            headers={
-                "Authorization": f"Bearer {access_token}",
-                "ST-App-Key": APP_KEY
-            }
-        )
-        response.raise_for_status()
-        return response.json()
+    return await _request("GET", "/payroll-settings", params=params)
 
 @mcp.tool()
 async def get_employee_payroll_settings(employee_id: int) -> dict:
     """Gets the employee payroll settings."""
-    access_token = await get_access_token()
-    
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{PAYROLL_BASE_URL}/tenant/{TENANT_ID}/employees/{employee_id}/payroll-settings",
-            headers={
-                "Authorization": f"Bearer {access_token}",
-                "ST-App-Key": APP_KEY
-            }
-        )
-        response.raise_for_status()
-        return response.json()
+    return await _request("GET", f"/employees/{employee_id}/payroll-settings")
 
 @mcp.tool()
 async def update_employee_payroll_settings(
@@ -784,41 +638,19 @@ async def update_employee_payroll_settings(
     hire_date: Optional[str] = None
 ) -> dict:
     """Updates the employee payroll settings."""
-    access_token = await get_access_token()
-    
-    body = {}
-    if external_payroll_id is not None: body["externalPayrollId"] = external_payroll_id
-    if hourly_rate is not None: body["hourlyRate"] = hourly_rate
-    if manager_id is not None: body["managerId"] = manager_id
-    if hire_date is not None: body["hireDate"] = hire_date
+    body = {k: v for k, v in (
+        ("externalPayrollId", external_payroll_id),
+        ("hourlyRate", hourly_rate),
+        ("managerId", manager_id),
+        ("hireDate", hire_date)
+    ) if v is not None}
     
-    async with httpx.AsyncClient() as client:
-        response = await client.put(
-            f"{PAYROLL_BASE_URL}/tenant/{TENANT_ID}/employees/{employee_id}/payroll-settings",
-            json=body,
-            headers={
-                "Authorization": f"Bearer {access_token}",
-                "ST-App-Key": APP_KEY
-            }
-        )
-        response.raise_for_status()
-        return response.json()
+    return await _request("PUT", f"/employees/{employee_id}/payroll-settings", json=body)
 
 @mcp.tool()
 async def get_technician_payroll_settings(technician_id: int) -> dict:
     """Gets the technician payroll settings."""
-    access_token = await get_access_token()
-    
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{PAYROLL_BASE_URL}/tenant/{TENANT_ID}/technicians/{technician_id}/payroll-settings",
-            headers={
-                "Authorization": f"Bearer {access_token}",
-                "ST-App-Key": APP_KEY
-            }
-        )
-        response.raise_for_status()
-        return response.json()
+    return await _request("GET", f"/technicians/{technician_id}/payroll-settings", cache=True)
 
 @mcp.tool()
 async def update_technician_payroll_settings(
@@ -829,81 +661,54 @@ async def update_technician_payroll_settings(
     hire_date: Optional[str] = None
 ) -> dict:
     """Updates the technician payroll settings."""
-    access_token = await get_access_token()
+    body = {k: v for k, v in (
+        ("externalPayrollId", external_payroll_id),
+        ("hourlyRate", hourly_rate),
+        ("managerId", manager_id),
+        ("hireDate", hire_date)
+    ) if v is not None}
     
-    body = {}
-    if external_payroll_id is not None: body["externalPayrollId"] = external_payroll_id
-    if hourly_rate is not None: body["hourlyRate"] = hourly_rate
-    if manager_id is not None: body["managerId"] = manager_id
-    if hire_date is not None: body["hireDate"] = hire_date
-    
-    async with httpx.AsyncClient() as client:
-        response = await client.put(
-            f"{PAYROLL_BASE_URL}/tenant/{TENANT_ID}/technicians/{technician_id}/payroll-settings",
-            json=body,
-            headers={
-                "Authorization": f"Bearer {access_token}",
-                "ST-App-Key": APP_KEY
-            }
-        )
-        response.raise_for_status()
-        return response.json()
+    try:
+        return await _request("PUT", f"/technicians/{technician_id}/payroll-settings", json=body)
+    finally:
+        # Don't let get_technician_payroll_settings serve the pre-update settings from its cache
+        invalidate_cache(BASE_URL, f"/technicians/{technician_id}/payroll-settings")
+
+@mcp.tool()
+async def bulk_get_technician_payroll_settings(technician_ids: List[int]) -> dict:
+    """
+    Gets the payroll settings of many technicians concurrently.
+
+    Returns {"results": [...], "errors": [...]}; results follow the order of
+    technician_ids (None where the lookup failed) and each error holds its index.
+    """
+    return await _gather_results(get_technician_payroll_settings(technician_id) for technician_id in technician_ids)
 
 # TIMESHEET CODES ENDPOINTS
 
-@mcp.tool()
-async def get_timesheet_codes(
-    created_before: Optional[str] = None,
-    created_on_or_after: Optional[str] = None,
-    modified_before: Optional[str] = None,
-    modified_on_or_after: Optional[str] = None,
-    page: Optional[int] = None,
-    page_size: Optional[int] = None,
-    include_total: Optional[bool] = None,
-    active: Optional[str] = None,
-    sort: Optional[str] = None
-) -> dict:
-    """Gets a list of timesheet codes."""
-    access_token = await get_access_token()
-    
-    params = {}
-    if created_before is not None: params["createdBefore"] = created_before
-    if created_on_or_after is not None: params["createdOnOrAfter"] = created_on_or_after
-    if modified_before is not None: params["modifiedBefore"] = modified_before
-    if modified_on_or_after is not None: params["modifiedOnOrAfter"] = modified_on_or_after
-    if page is not None: params["page"] = page
-    if page_size is not None: params["pageSize"] = page_size
-    if include_total is not None: params["includeTotal"] = include_total
-    if active is not None: params["active"] = active
-    if sort is not None: params["sort"] = sort
-    
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{PAYROLL_BASE_URL}/tenant/{TENANT_ID}/timesheet-codes",
-            params=params,
-            headers={
-                "Authorization": f"Bearer {access_token}",
-                "ST-App-Key": APP_KEY
-            }
-        )
-        response.raise_for_status()
-        return response.json()
+get_timesheet_codes = mcp.tool()(make_list_tool(
+    BASE_URL, "get_timesheet_codes", "/timesheet-codes", "Gets a list of timesheet codes.",
+    _CHANGED_PARAMS + _PAGING_PARAMS + (
+        ("active", "active", Optional[str], None, 'What kind of items should be returned ("True", "Any", "False")'),
+        ("sort", "sort", Optional[str], None, "Sort by field (+FieldName for ascending, -FieldName for descending)")
+    ),
+    convert=_query_value
+))
 
 @mcp.tool()
 async def get_timesheet_code_by_id(timesheet_code_id: int) -> dict:
     """Gets timesheet code specified by ID."""
-    access_token = await get_access_token()
-    
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{PAYROLL_BASE_URL}/tenant/{TENANT_ID}/timesheet-codes/{timesheet_code_id}",
-            headers={
-                "Authorization": f"Bearer {access_token}",
-                "ST-App-Key": APP_KEY
-            }
-        )
-        response.raise_for_status()
-        return response.json()
+    return await _request("GET", f"/timesheet-codes/{timesheet_code_id}", cache=True)
+
+@mcp.tool()
+async def bulk_get_timesheet_codes(timesheet_code_ids: List[int]) -> dict:
+    """
+    Gets many timesheet codes by ID concurrently.
+
+    Returns {"results": [...], "errors": [...]}; results follow the order of
+    timesheet_code_ids (None where the lookup failed) and each error holds its index.
+    """
+    return await _gather_results(get_timesheet_code_by_id(timesheet_code_id) for timesheet_code_id in timesheet_code_ids)
 
 # JOB TIMESHEETS ENDPOINTS
 
@@ -913,42 +718,31 @@ async def get_job_timesheets(
     page: Optional[int] = None,
     page_size: Optional[int] = None,
     include_total: Optional[bool] = None,
-    created_before: Optional[str] = None,
-    created_on_or_after: Optional[str] = None,
-    modified_before: Optional[str] = None,
-    modified_on_or_after: Optional[str] = None,
+    created_before: Optional[datetime] = None,
+    created_on_or_after: Optional[datetime] = None,
+    modified_before: Optional[datetime] = None,
+    modified_on_or_after: Optional[datetime] = None,
     technician_id: Optional[int] = None,
-    started_on: Optional[str] = None,
-    ended_on: Optional[str] = None,
+    started_on: Optional[datetime] = None,
+    ended_on: Optional[datetime] = None,
     sort: Optional[str] = None
 ) -> dict:
     """Gets a list of job timesheets."""
-    access_token = await get_access_token()
-    
-    params = {}
-    if page is not None: params["page"] = page
-    if page_size is not None: params["pageSize"] = page_size
-    if include_total is not None: params["includeTotal"] = include_total
-    if created_before is not None: params["createdBefore"] = created_before
-    if created_on_or_after is not None: params["createdOnOrAfter"] = created_on_or_after
-    if modified_before is not None: params["modifiedBefore"] = modified_before
-    if modified_on_or_after is not None: params["modifiedOnOrAfter"] = modified_on_or_after
-    if technician_id is not None: params["technicianId"] = technician_id
-    if started_on is not None: params["startedOn"] = started_on
-    if ended_on is not None: params["endedOn"] = ended_on
-    if sort is not None: params["sort"] = sort
-    
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{PAYROLL_BASE_URL}/tenant/{TENANT_ID}/jobs/{job_id}/timesheets",
-            params=params,
-            headers={
-                "Authorization": f"Bearer {access_token}",
-                "ST-App-Key": APP_KEY
-            }
-        )
-        response.raise_for_status()
-        return response.json()
+    params = {k: v for k, v in (
+        ("page", page),
+        ("pageSize", page_size),
+        ("includeTotal", include_total),
+        ("createdBefore", _iso(created_before)),
+        ("createdOnOrAfter", _iso(created_on_or_after)),
+        ("modifiedBefore", _iso(modified_before)),
+        ("modifiedOnOrAfter", _iso(modified_on_or_after)),
+        ("technicianId", technician_id),
+        ("startedOn", _iso(started_on)),
+        ("endedOn", _iso(ended_on)),
+        ("sort", sort)
+    ) if v is not None}
+    
+    return await _request("GET", f"/jobs/{job_id}/timesheets", params=params)
 
 @mcp.tool()
 async def create_job_timesheet(
@@ -961,28 +755,18 @@ async def create_job_timesheet(
     done_on: Optional[str] = None
 ) -> dict:
     """Creates new job timesheet."""
-    access_token = await get_access_token()
-    
     body = {
         "appointmentId": appointment_id,
         "technicianId": technician_id
     }
-    if dispatched_on is not None: body["dispatchedOn"] = dispatched_on
-    if arrived_on is not None: body["arrivedOn"] = arrived_on
-    if canceled_on is not None: body["canceledOn"] = canceled_on
-    if done_on is not None: body["doneOn"] = done_on
+    body.update((k, v) for k, v in (
+        ("dispatchedOn", dispatched_on),
+        ("arrivedOn", arrived_on),
+        ("canceledOn", canceled_on),
+        ("doneOn", done_on)
+    ) if v is not None)
     
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            f"{PAYROLL_BASE_URL}/tenant/{TENANT_ID}/jobs/{job_id}/timesheets",
-            json=body,
-            headers={
-                "Authorization": f"Bearer {access_token}",
-                "ST-App-Key": APP_KEY
-            }
-        )
-        response.raise_for_status()
-        return response.json()
+    return await _request("POST", f"/jobs/{job_id}/timesheets", json=body)
 
 @mcp.tool()
 async def update_job_timesheet(
@@ -996,116 +780,93 @@ async def update_job_timesheet(
     done_on: Optional[str] = None
 ) -> dict:
     """Update specified job timesheet."""
-    access_token = await get_access_token()
-    
     body = {
         "appointmentId": appointment_id,
         "technicianId": technician_id
     }
-    if dispatched_on is not None: body["dispatchedOn"] = dispatched_on
-    if arrived_on is not None: body["arrivedOn"] = arrived_on
-    if canceled_on is not None: body["canceledOn"] = canceled_on
-    if done_on is not None: body["doneOn"] = done_on
-    
-    async with httpx.AsyncClient() as client:
-        response = await client.put(
-            f"{PAYROLL_BASE_URL}/tenant/{TENANT_ID}/jobs/{job_id}/timesheets/{timesheet_id}",
-            json=body,
-            headers={
-                "Authorization": f"Bearer {access_token}",
-                "ST-App-Key": APP_KEY
-            }
-        )
-        response.raise_for_status()
-        return response.json()
-
-@mcp.tool()
-async def get_job_timesheets_by_multiple_jobs(
-    job_ids: Optional[str] = None,
-    page: Optional[int] = None,
-    page_size: Optional[int] = None,
-    include_total: Optional[bool] = None,
-    created_before: Optional[str] = None,
-    created_on_or_after: Optional[str] = None,
-    modified_before: Optional[str] = None,
-    modified_on_or_after: Optional[str] = None,
-    technician_id: Optional[int] = None,
-    started_on: Optional[str] = None,
-    ended_on: Optional[str] = None,
-    sort: Optional[str] = None
-) -> dict:
-    """Gets a list of job timesheets by multiple jobs."""
-    access_token = await get_access_token()
-    
-    params = {}
-    if job_ids is not None: params["jobIds"] = job_ids
-    if page is not None: params["page"] = page
-    if page_size is not None: params["pageSize"] = page_size
-    if include_total is not None: params["includeTotal"] = include_total
-    if created_before is not None: params["createdBefore"] = created_before
-    if created_on_or_after is not None: params["createdOnOrAfter"] = created_on_or_after
-    if modified_before is not None: params["modifiedBefore"] = modified_before
-    if modified_on_or_after is not None: params["modifiedOnOrAfter"] = modified_on_or_after
-    if technician_id is not None: params["technicianId"] = technician_id
-    if started_on is not None: params["startedOn"] = started_on
-    if ended_on is not None: params["endedOn"] = ended_on
-    if sort is not None: params["sort"] = sort
-    
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{PAYROLL_BASE_URL}/tenant/{TENANT_ID}/jobs/timesheets",
-            params=params,
-            headers={
-                "Authorization": f"Bearer {access_token}",
-                "ST-App-Key": APP_KEY
-            }
-        )
-        response.raise_for_status()
-        return response.json()
+    body.update((k, v) for k, v in (
+        ("dispatchedOn", dispatched_on),
+        ("arrivedOn", arrived_on),
+        ("canceledOn", canceled_on),
+        ("doneOn", done_on)
+    ) if v is not None)
+    
+    return await _request("PUT", f"/jobs/{job_id}/timesheets/{timesheet_id}", json=body)
+
+get_job_timesheets_by_multiple_jobs = mcp.tool()(make_list_tool(
+    BASE_URL, "get_job_timesheets_by_multiple_jobs", "/jobs/timesheets", "Gets a list of job timesheets by multiple jobs.",
+    (("job_ids", "jobIds", Optional[str], None, "Comma-separated job IDs"),) + _PAGING_PARAMS + _CHANGED_PARAMS + (
+        ("technician_id", "technicianId", Optional[int], None, "Filter by technician ID"),
+        ("started_on", "startedOn", Optional[datetime], None, "Return timesheets started on or after date/time"),
+        ("ended_on", "endedOn", Optional[datetime], None, "Return timesheets ended before date/time"),
+        ("sort", "sort", Optional[str], None, "Sort by field (+FieldName for ascending, -FieldName for descending)")
+    ),
+    convert=_query_value
+))
 
 # NON-JOB TIMESHEETS ENDPOINTS
 
-@mcp.tool()
-async def get_non_job_timesheets(
-    page: Optional[int] = None,
-    page_size: Optional[int] = None,
-    include_total: Optional[bool] = None,
-    created_before: Optional[str] = None,
-    created_on_or_after: Optional[str] = None,
-    modified_before: Optional[str] = None,
-    modified_on_or_after: Optional[str] = None,
-    employee_id: Optional[int] = None,
-    employee_type: Optional[str] = None,
-    active: Optional[str] = None,
-    sort: Optional[str] = None
+get_non_job_timesheets = mcp.tool()(make_list_tool(
+    BASE_URL, "get_non_job_timesheets", "/non-job-timesheets", "Gets a list of non job timesheets for employee.",
+    _PAGING_PARAMS + _CHANGED_PARAMS + (
+        ("employee_id", "employeeId", Optional[int], None, "Filter by employee ID"),
+        ("employee_type", "employeeType", Optional[str], None, "Filter by employee type (Technician, Employee)"),
+        ("active", "active", Optional[str], None, 'What kind of items should be returned ("True", "Any", "False")'),
+        ("sort", "sort", Optional[str], None, "Sort by field (+FieldName for ascending, -FieldName for descending)")
+    ),
+    convert=_query_value
+))
+
+# PAGINATION
+
+# Resource name -> paged list endpoint, used by get_all_pages
+PAGED_ENDPOINTS = {
+    "gross_pay_items": "/gross-pay-items",
+    "job_splits": "/jobs/splits",
+    "location_rates": "/locations/rates",
+    "activity_codes": "/activity-codes",
+    "payroll_adjustments": "/payroll-adjustments",
+    "payrolls": "/payrolls",
+    "payroll_settings": "/payroll-settings",
+    "timesheet_codes": "/timesheet-codes",
+    "job_timesheets": "/jobs/timesheets",
+    "non_job_timesheets": "/non-job-timesheets"
+}
+
+@mcp.tool()
+async def get_all_pages(
+    resource: str,
+    filters: Optional[Dict[str, Any]] = None,
+    page_size: int = 200,
+    concurrency: int = 4
 ) -> dict:
-    """Gets a list of non job timesheets for employee."""
-    access_token = await get_access_token()
-    
-    params = {}
-    if page is not None: params["page"] = page
-    if page_size is not None: params["pageSize"] = page_size
-    if include_total is not None: params["includeTotal"] = include_total
-    if created_before is not None: params["createdBefore"] = created_before
-    if created_on_or_after is not None: params["createdOnOrAfter"] = created_on_or_after
-    if modified_before is not None: params["modifiedBefore"] = modified_before
-    if modified_on_or_after is not None: params["modifiedOnOrAfter"] = modified_on_or_after
-    if employee_id is not None: params["employeeId"] = employee_id
-    if employee_type is not None: params["employeeType"] = employee_type
-    if active is not None: params["active"] = active
-    if sort is not None: params["sort"] = sort
-    
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{PAYROLL_BASE_URL}/tenant/{TENANT_ID}/non-job-timesheets",
-            params=params,
-            headers={
-                "Authorization": f"Bearer {access_token}",
-                "ST-App-Key": APP_KEY
-            }
-        )
-        response.raise_for_status()
-        return response.json()
+    """
+    Fetches every record of a payroll list, requesting several pages concurrently.
+
+    Args:
+        resource: List to walk (gross_pay_items, job_splits, location_rates,
+            activity_codes, payroll_adjustments, payrolls, payroll_settings,
+            timesheet_codes, job_timesheets, non_job_timesheets)
+        filters: Extra query parameters, using the API's names (e.g. {"employeeType": "Technician"})
+        page_size: Records per page request
+        concurrency: Number of page requests kept in flight
+
+    Returns {"data": [...], "totalCount": n, "errors": [...]} with the records of
+    every page in order; pages that fail are listed in errors by page number.
+    """
+    path = PAGED_ENDPOINTS.get(resource)
+    if path is None:
+        return {"error": "Unknown resource", "message": f"Unsupported resource: {resource}"}
+
+    filters = filters or {}
+    return await fetch_all_pages(
+        lambda page, include_total: _request("GET", path, params={
+            **filters, "page": page, "pageSize": page_size, "includeTotal": include_total
+        }),
+        page_size,
+        concurrency
+    )
 
 if __name__ == "__main__":
+    install_event_loop()
     mcp.run(transport="stdio") 
\ No newline at end of file
@@ -1,48 +1,41 @@
 from mcp.server.fastmcp import FastMCP
-from dotenv import load_dotenv
-import os
-import httpx
-from typing import Optional
+import asyncio
+import inspect
+from typing import Any, Callable, Dict, List, Optional
+from servicetitan_common import (
+    TENANT_ID, fetch_all_pages, install_event_loop, invalidate_cache, request, warmup_lifespan
+)
 
-# Load .env values
-load_dotenv()
-
-# Env vars
-CLIENT_ID = os.getenv("SERVICE_TITAN_CLIENT_ID")
-CLIENT_SECRET = os.getenv("SERVICE_TITAN_CLIENT_SECRET")
-APP_KEY = os.getenv("SERVICE_TITAN_APP_KEY")
-TENANT_ID = os.getenv("SERVICE_TITAN_TENANT_ID")
-
-# OAuth + API URLs
-TOKEN_URL = "https://auth.servicetitan.io/connect/token"
+# Tenant-scoped base URL for every pricebook endpoint
+BASE_URL = f"https://api.servicetitan.io/pricebook/v2/tenant/{TENANT_ID}"
 
 # FastMCP instance for Pricebook v2 API
-mcp = FastMCP("servicetitan-pricebook")
-
-async def get_access_token() -> str:
-    """Fetch OAuth2 access token from ServiceTitan."""
-    if not CLIENT_ID or not CLIENT_SECRET or not APP_KEY or not TENANT_ID:
-        error_msg = "ERROR_ENV: One or more ServiceTitan environment variables are not set."
-        raise ValueError(error_msg)
-
-    async with httpx.AsyncClient() as client:
-        headers = { "Content-Type": "application/x-www-form-urlencoded" }
-        data = {
-            "grant_type": "client_credentials",
-            "client_id": CLIENT_ID,
-            "client_secret": CLIENT_SECRET
-        }
-        response = await client.post(TOKEN_URL, data=data, headers=headers)
-        response.raise_for_status()
-        token_response_json = response.json()
-        
-        access_token = token_response_json.get("access_token")
-        
-        if not isinstance(access_token, str):
-            error_msg = f"ERROR_TOKEN: access_token is not a string or is missing. Type: {type(access_token)}, Value: {access_token}"
-            raise TypeError(error_msg)
-            
-        return access_token
+mcp = FastMCP(
+    "servicetitan-pricebook",
+    lifespan=warmup_lifespan(BASE_URL, "/materials/costtypes", {"pageSize": 1})
+)
+
+async def _request(
+    method: str,
+    path: str,
+    *,
+    params: Optional[Dict[str, Any]] = None,
+    json: Any = None,
+    cache: bool = False,
+    not_found_msg: Optional[str] = None,
+    none_on_404: bool = False
+) -> Any:
+    """
+    Make an authenticated request to the Pricebook API and return the decoded JSON body.
+
+    Bodies are encoded and responses decoded with orjson (see servicetitan_common.request).
+    With cache=True, GET responses are reused for a short time. With not_found_msg,
+    a 404 returns {"error": not_found_msg} instead of raising; with none_on_404, None.
+    """
+    return await request(
+        BASE_URL, method, path,
+        params=params, json_data=json, cache=cache, not_found_msg=not_found_msg, none_on_404=none_on_404
+    )
 
 # PRICEBOOK V2 API ENDPOINTS
 
@@ -84,39 +77,25 @@ async def get_materials(
         external_data_key: Filter by external data key
         external_data_values: Filter by external data values
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY
-    }
-
-    url = f"https://api.servicetitan.io/pricebook/v2/tenant/{TENANT_ID}/materials"
-
-    params = {
-        "isOtherDirectCost": is_other_direct_cost,
-        "costTypeIds": cost_type_ids,
-        "page": page,
-        "pageSize": page_size,
-        "includeTotal": include_total,
-        "sort": sort,
-        "ids": ids,
-        "createdBefore": created_before,
-        "createdOnOrAfter": created_on_or_after,
-        "modifiedBefore": modified_before,
-        "modifiedOnOrAfter": modified_on_or_after,
-        "active": active,
-        "externalDataApplicationGuid": external_data_application_guid,
-        "externalDataKey": external_data_key,
-        "externalDataValues": external_data_values
-    }
-
-    # Remove None values from params
-    clean_params = {k: v for k, v in params.items() if v is not None}
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers, params=clean_params)
-        response.raise_for_status()
-        return response.json()
+    params = {k: v for k, v in (
+        ("isOtherDirectCost", is_other_direct_cost),
+        ("costTypeIds", cost_type_ids),
+        ("page", page),
+        ("pageSize", page_size),
+        ("includeTotal", include_total),
+        ("sort", sort),
+        ("ids", ids),
+        ("createdBefore", created_before),
+        ("createdOnOrAfter", created_on_or_after),
+        ("modifiedBefore", modified_before),
+        ("modifiedOnOrAfter", modified_on_or_after),
+        ("active", active),
+        ("externalDataApplicationGuid", external_data_application_guid),
+        ("externalDataKey", external_data_key),
+        ("externalDataValues", external_data_values)
+    ) if v is not None}
+
+    return await _request("GET", "/materials", params=params)
 
 @mcp.tool()
 async def get_services(
@@ -152,37 +131,96 @@ async def get_services(
         external_data_key: Filter by external data key
         external_data_values: Filter by external data values
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY
-    }
+    params = {k: v for k, v in (
+        ("page", page),
+        ("pageSize", page_size),
+        ("includeTotal", include_total),
+        ("sort", sort),
+        ("ids", ids),
+        ("createdBefore", created_before),
+        ("createdOnOrAfter", created_on_or_after),
+        ("modifiedBefore", modified_before),
+        ("modifiedOnOrAfter", modified_on_or_after),
+        ("active", active),
+        ("externalDataApplicationGuid", external_data_application_guid),
+        ("externalDataKey", external_data_key),
+        ("externalDataValues", external_data_values)
+    ) if v is not None}
+
+    return await _request("GET", "/services", params=params)
+
+# Optional body fields for create_material, in the same order as its arguments
+_CREATE_MATERIAL_KEYS = (
+    "displayName", "cost", "active", "price", "memberPrice", "addOnPrice", "addOnMemberPrice",
+    "hours", "bonus", "commissionBonus", "paysCommission", "deductAsJobCost", "unitOfMeasure",
+    "isInventory", "account", "costOfSaleAccount", "assetAccount", "intacctGlGroupAccount",
+    "taxable", "primaryVendor", "otherVendors", "assets", "categories", "externalData",
+    "isConfigurableMaterial", "chargeableByDefault", "variationMaterials", "isOtherDirectCost",
+    "costTypeId", "budgetCostCode", "budgetCostType"
+)
+
+# Paging arguments of the list tools, left out of the get_all_* tools' arguments
+_PAGING_ARGS = ("page", "page_size", "include_total")
+
+async def _get_all_pages(list_tool: Callable, page_size: int, concurrency: int, filters: Dict[str, Any]) -> dict:
+    """Fetch every page of a list tool through servicetitan_common.fetch_all_pages."""
+    return await fetch_all_pages(
+        lambda page, include_total: list_tool(
+            page=page, page_size=page_size, include_total=include_total, **filters
+        ),
+        page_size,
+        concurrency
+    )
+
+def _all_pages_signature(list_tool: Callable) -> inspect.Signature:
+    """Signature for a get_all_* tool: page_size and concurrency, then the list tool's filters."""
+    return inspect.Signature(
+        [
+            inspect.Parameter("page_size", inspect.Parameter.KEYWORD_ONLY, default=200, annotation=int),
+            inspect.Parameter("concurrency", inspect.Parameter.KEYWORD_ONLY, default=8, annotation=int)
+        ] + [
+            parameter.replace(kind=inspect.Parameter.KEYWORD_ONLY)
+            for name, parameter in inspect.signature(list_tool).parameters.items()
+            if name not in _PAGING_ARGS
+        ],
+        return_annotation=dict
+    )
+
+async def get_all_materials(page_size: int = 200, concurrency: int = 8, **filters: Any) -> dict:
+    """
+    Retrieve every material matching the filters in one call.
+
+    The first page reports the total count, then the remaining pages are
+    requested concurrently instead of one get_materials call per page.
+    Accepts the same filters as get_materials. Pages that fail are listed
+    under "errors" (see servicetitan_common.fetch_all_pages).
 
-    url = f"https://api.servicetitan.io/pricebook/v2/tenant/{TENANT_ID}/services"
-
-    params = {
-        "page": page,
-        "pageSize": page_size,
-        "includeTotal": include_total,
-        "sort": sort,
-        "ids": ids,
-        "createdBefore": created_before,
-        "createdOnOrAfter": created_on_or_after,
-        "modifiedBefore": modified_before,
-        "modifiedOnOrAfter": modified_on_or_after,
-        "active": active,
-        "externalDataApplicationGuid": external_data_application_guid,
-        "externalDataKey": external_data_key,
-        "externalDataValues": external_data_values
-    }
+    Args:
+        page_size: Number of records to request per page
+        concurrency: Maximum number of pages requested at once
+    """
+    return await _get_all_pages(get_materials, page_size, concurrency, filters)
+
+get_all_materials.__signature__ = _all_pages_signature(get_materials)
+mcp.tool()(get_all_materials)
 
-    # Remove None values from params
-    clean_params = {k: v for k, v in params.items() if v is not None}
+async def get_all_services(page_size: int = 200, concurrency: int = 8, **filters: Any) -> dict:
+    """
+    Retrieve every service matching the filters in one call.
+
+    The first page reports the total count, then the remaining pages are
+    requested concurrently instead of one get_services call per page.
+    Accepts the same filters as get_services. Pages that fail are listed
+    under "errors" (see servicetitan_common.fetch_all_pages).
+
+    Args:
+        page_size: Number of records to request per page
+        concurrency: Maximum number of pages requested at once
+    """
+    return await _get_all_pages(get_services, page_size, concurrency, filters)
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers, params=clean_params)
-        response.raise_for_status()
-        return response.json()
+get_all_services.__signature__ = _all_pages_signature(get_services)
+mcp.tool()(get_all_services)
 
 @mcp.tool()
 async def create_material(
@@ -258,15 +296,6 @@ async def create_material(
         budget_cost_code: The Budget CostCode segment for this entity
         budget_cost_type: The Budget CostType segment for this entity
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY,
-        "Content-Type": "application/json"
-    }
-
-    url = f"https://api.servicetitan.io/pricebook/v2/tenant/{TENANT_ID}/materials"
-
     # Build request body with only non-None values
     request_body = {
         "code": code,
@@ -274,73 +303,17 @@ async def create_material(
     }
 
     # Add optional fields only if they are not None
-    if display_name is not None:
-        request_body["displayName"] = display_name
-    if cost is not None:
-        request_body["cost"] = cost
-    if active is not None:
-        request_body["active"] = active
-    if price is not None:
-        request_body["price"] = price
-    if member_price is not None:
-        request_body["memberPrice"] = member_price
-    if add_on_price is not None:
-        request_body["addOnPrice"] = add_on_price
-    if add_on_member_price is not None:
-        request_body["addOnMemberPrice"] = add_on_member_price
-    if hours is not None:
-        request_body["hours"] = hours
-    if bonus is not None:
-        request_body["bonus"] = bonus
-    if commission_bonus is not None:
-        request_body["commissionBonus"] = commission_bonus
-    if pays_commission is not None:
-        request_body["paysCommission"] = pays_commission
-    if deduct_as_job_cost is not None:
-        request_body["deductAsJobCost"] = deduct_as_job_cost
-    if unit_of_measure is not None:
-        request_body["unitOfMeasure"] = unit_of_measure
-    if is_inventory is not None:
-        request_body["isInventory"] = is_inventory
-    if account is not None:
-        request_body["account"] = account
-    if cost_of_sale_account is not None:
-        request_body["costOfSaleAccount"] = cost_of_sale_account
-    if asset_account is not None:
-        request_body["assetAccount"] = asset_account
-    if intacct_gl_group_account is not None:
-        request_body["intacctGlGroupAccount"] = intacct_gl_group_account
-    if taxable is not None:
-        request_body["taxable"] = taxable
-    if primary_vendor is not None:
-        request_body["primaryVendor"] = primary_vendor
-    if other_vendors is not None:
-        request_body["otherVendors"] = other_vendors
-    if assets is not None:
-        request_body["assets"] = assets
-    if categories is not None:
-        request_body["categories"] = categories
-    if external_data is not None:
-        request_body["externalData"] = external_data
-    if is_configurable_material is not None:
-        request_body["isConfigurableMaterial"] = is_configurable_material
-    if chargeable_by_default is not None:
-        request_body["chargeableByDefault"] = chargeable_by_default
-    if variation_materials is not None:
-        request_body["variationMaterials"] = variation_materials
-    if is_other_direct_cost is not None:
-        request_body["isOtherDirectCost"] = is_other_direct_cost
-    if cost_type_id is not None:
-        request_body["costTypeId"] = cost_type_id
-    if budget_cost_code is not None:
-        request_body["budgetCostCode"] = budget_cost_code
-    if budget_cost_type is not None:
-        request_body["budgetCostType"] = budget_cost_type
-
-    async with httpx.AsyncClient() as client:
-        response = await client.post(url, headers=headers, json=request_body)
-        response.raise_for_status()
-        return response.json()
+    values = (
+        display_name, cost, active, price, member_price, add_on_price, add_on_member_price, hours,
+        bonus, commission_bonus, pays_commission, deduct_as_job_cost, unit_of_measure, is_inventory,
+        account, cost_of_sale_account, asset_account, intacct_gl_group_account, taxable,
+        primary_vendor, other_vendors, assets, categories, external_data, is_configurable_material,
+        chargeable_by_default, variation_materials, is_other_direct_cost, cost_type_id,
+        budget_cost_code, budget_cost_type
+    )
+    request_body.update((k, v) for k, v in zip(_CREATE_MATERIAL_KEYS, values) if v is not None)
+
+    return await _request("POST", "/materials", json=request_body)
 
 @mcp.tool()
 async def get_material_cost_types() -> dict:
@@ -350,18 +323,8 @@ async def get_material_cost_types() -> dict:
     Returns a paginated response containing cost types with their IDs and names.
     These cost types can be used when creating materials with isOtherDirectCost=True.
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY
-    }
-
-    url = f"https://api.servicetitan.io/pricebook/v2/tenant/{TENANT_ID}/materials/costtypes"
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers)
-        response.raise_for_status()
-        return response.json()
+    # Cost types are reference data that rarely change
+    return await _request("GET", "/materials/costtypes", cache=True)
 
 @mcp.tool()
 async def get_material_by_id(
@@ -379,24 +342,66 @@ async def get_material_by_id(
         Material details including pricing, vendor info, categories, assets, and metadata.
         Returns an error dict if the material is not found.
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY
-    }
-
-    url = f"https://api.servicetitan.io/pricebook/v2/tenant/{TENANT_ID}/materials/{material_id}"
-
     params = {}
     if external_data_application_guid is not None:
         params["externalDataApplicationGuid"] = external_data_application_guid
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers, params=params)
-        if response.status_code == 404:
-            return {"error": f"Material {material_id} not found"}
-        response.raise_for_status()
-        return response.json()
+    return await _request(
+        "GET", f"/materials/{material_id}",
+        params=params, cache=True, not_found_msg=f"Material {material_id} not found"
+    )
+
+# Most IDs the list endpoints accept in a single ids= filter
+_MAX_IDS_PER_REQUEST = 50
+
+@mcp.tool()
+async def get_materials_by_ids(
+    material_ids: List[str],
+    external_data_application_guid: Optional[str] = None
+) -> dict:
+    """
+    Retrieve many materials by ID in one call.
+
+    IDs are looked up through get_materials' ids filter, 50 per request, with
+    the requests sent concurrently instead of one get_material_by_id call per ID.
+
+    Args:
+        material_ids: IDs of the materials to retrieve
+        external_data_application_guid: Optional GUID for filtering external data
+
+    Returns:
+        {"data": [...], "notFound": [...]}; data follows the order of material_ids
+        and notFound lists the IDs ServiceTitan did not return.
+    """
+    chunks = [
+        material_ids[start:start + _MAX_IDS_PER_REQUEST]
+        for start in range(0, len(material_ids), _MAX_IDS_PER_REQUEST)
+    ]
+    pages = await asyncio.gather(*(
+        get_materials(
+            ids=",".join(map(str, chunk)),
+            page_size=len(chunk),
+            active="Any",
+            external_data_application_guid=external_data_application_guid
+        )
+        for chunk in chunks
+    ))
+
+    by_id = {str(material["id"]): material for page in pages for material in page.get("data", [])}
+    return {
+        "data": [by_id[str(material_id)] for material_id in material_ids if str(material_id) in by_id],
+        "notFound": [material_id for material_id in material_ids if str(material_id) not in by_id]
+    }
+
+# Optional body fields for update_material, in the same order as its arguments
+_UPDATE_MATERIAL_KEYS = (
+    "code", "displayName", "description", "cost", "active", "price", "memberPrice", "addOnPrice",
+    "addOnMemberPrice", "hours", "bonus", "commissionBonus", "paysCommission", "deductAsJobCost",
+    "unitOfMeasure", "isInventory", "account", "costOfSaleAccount", "assetAccount",
+    "intacctGlGroupAccount", "taxable", "primaryVendor", "otherVendors", "assets", "categories",
+    "externalData", "isConfigurableMaterial", "chargeableByDefault", "variationMaterials",
+    "costTypeId", "budgetCostCode", "budgetCostType"
+)
 
 @mcp.tool()
 async def update_material(
@@ -472,90 +477,30 @@ async def update_material(
         budget_cost_code: The Budget CostCode segment for this entity
         budget_cost_type: The Budget CostType segment for this entity
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY,
-        "Content-Type": "application/json"
-    }
-
-    url = f"https://api.servicetitan.io/pricebook/v2/tenant/{TENANT_ID}/materials/{material_id}"
-
     # Build request body with only non-None values
-    request_body = {}
-
-    # Add optional fields only if they are not None
-    if code is not None:
-        request_body["code"] = code
-    if display_name is not None:
-        request_body["displayName"] = display_name
-    if description is not None:
-        request_body["description"] = description
-    if cost is not None:
-        request_body["cost"] = cost
-    if active is not None:
-        request_body["active"] = active
-    if price is not None:
-        request_body["price"] = price
-    if member_price is not None:
-        request_body["memberPrice"] = member_price
-    if add_on_price is not None:
-        request_body["addOnPrice"] = add_on_price
-    if add_on_member_price is not None:
-        request_body["addOnMemberPrice"] = add_on_member_price
-    if hours is not None:
-        request_body["hours"] = hours
-    if bonus is not None:
-        request_body["bonus"] = bonus
-    if commission_bonus is not None:
-        request_body["commissionBonus"] = commission_bonus
-    if pays_commission is not None:
-        request_body["paysCommission"] = pays_commission
-    if deduct_as_job_cost is not None:
-        request_body["deductAsJobCost"] = deduct_as_job_cost
-    if unit_of_measure is not None:
-        request_body["unitOfMeasure"] = unit_of_measure
-    if is_inventory is not None:
-        request_body["isInventory"] = is_inventory
-    if account is not None:
-        request_body["account"] = account
-    if cost_of_sale_account is not None:
-        request_body["costOfSaleAccount"] = cost_of_sale_account
-    if asset_account is not None:
-        request_body["assetAccount"] = asset_account
-    if intacct_gl_group_account is not None:
-        request_body["intacctGlGroupAccount"] = intacct_gl_group_account
-    if taxable is not None:
-        request_body["taxable"] = taxable
-    if primary_vendor is not None:
-        request_body["primaryVendor"] = primary_vendor
-    if other_vendors is not None:
-        request_body["otherVendors"] = other_vendors
-    if assets is not None:
-        request_body["assets"] = assets
-    if categories is not None:
-        request_body["categories"] = categories
-    if external_data is not None:
-        request_body["externalData"] = external_data
-    if is_configurable_material is not None:
-        request_body["isConfigurableMaterial"] = is_configurable_material
-    if chargeable_by_default is not None:
-        request_body["chargeableByDefault"] = chargeable_by_default
-    if variation_materials is not None:
-        request_body["variationMaterials"] = variation_materials
-    if cost_type_id is not None:
-        request_body["costTypeId"] = cost_type_id
-    if budget_cost_code is not None:
-        request_body["budgetCostCode"] = budget_cost_code
-    if budget_cost_type is not None:
-        request_body["budgetCostType"] = budget_cost_type
-
-    async with httpx.AsyncClient() as client:
-        response = await client.patch(url, headers=headers, json=request_body)
-        if response.status_code == 404:
-            return {"error": f"Material {material_id} not found"}
-        response.raise_for_status()
-        return response.json()
+    values = (
+        code, display_name, description, cost, active, price, member_price, add_on_price,
+        add_on_member_price, hours, bonus, commission_bonus, pays_commission, deduct_as_job_cost,
+        unit_of_measure, is_inventory, account, cost_of_sale_account, asset_account,
+        intacct_gl_group_account, taxable, primary_vendor, other_vendors, assets, categories,
+        external_data, is_configurable_material, chargeable_by_default, variation_materials,
+        cost_type_id, budget_cost_code, budget_cost_type
+    )
+    request_body = {k: v for k, v in zip(_UPDATE_MATERIAL_KEYS, values) if v is not None}
+
+    try:
+        return await _request("PATCH", f"/materials/{material_id}", json=request_body, not_found_msg=f"Material {material_id} not found")
+    finally:
+        # Don't let get_material_by_id serve the pre-update material from its cache
+        invalidate_cache(BASE_URL, f"/materials/{material_id}")
+
+# Optional body fields for create_service, in the same order as its arguments
+_CREATE_SERVICE_KEYS = (
+    "displayName", "serviceMaterials", "serviceEquipment", "recommendations", "upgrades",
+    "warranty", "categories", "price", "memberPrice", "addOnPrice", "addOnMemberPrice", "taxable",
+    "account", "intacctGlGroupAccount", "hours", "isLabor", "assets", "active", "crossSaleGroup",
+    "paysCommission", "bonus", "commissionBonus", "externalData", "budgetCostCode", "budgetCostType"
+)
 
 @mcp.tool()
 async def create_service(
@@ -619,15 +564,6 @@ async def create_service(
         budget_cost_code: The Budget CostCode segment for this entity
         budget_cost_type: The Budget CostType segment for this entity
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY,
-        "Content-Type": "application/json"
-    }
-
-    url = f"https://api.servicetitan.io/pricebook/v2/tenant/{TENANT_ID}/services"
-
     # Build request body with required fields
     request_body = {
         "code": code,
@@ -635,61 +571,15 @@ async def create_service(
     }
 
     # Add optional fields only if they are not None
-    if display_name is not None:
-        request_body["displayName"] = display_name
-    if service_materials is not None:
-        request_body["serviceMaterials"] = service_materials
-    if service_equipment is not None:
-        request_body["serviceEquipment"] = service_equipment
-    if recommendations is not None:
-        request_body["recommendations"] = recommendations
-    if upgrades is not None:
-        request_body["upgrades"] = upgrades
-    if warranty is not None:
-        request_body["warranty"] = warranty
-    if categories is not None:
-        request_body["categories"] = categories
-    if price is not None:
-        request_body["price"] = price
-    if member_price is not None:
-        request_body["memberPrice"] = member_price
-    if add_on_price is not None:
-        request_body["addOnPrice"] = add_on_price
-    if add_on_member_price is not None:
-        request_body["addOnMemberPrice"] = add_on_member_price
-    if taxable is not None:
-        request_body["taxable"] = taxable
-    if account is not None:
-        request_body["account"] = account
-    if intacct_gl_group_account is not None:
-        request_body["intacctGlGroupAccount"] = intacct_gl_group_account
-    if hours is not None:
-        request_body["hours"] = hours
-    if is_labor is not None:
-        request_body["isLabor"] = is_labor
-    if assets is not None:
-        request_body["assets"] = assets
-    if active is not None:
-        request_body["active"] = active
-    if cross_sale_group is not None:
-        request_body["crossSaleGroup"] = cross_sale_group
-    if pays_commission is not None:
-        request_body["paysCommission"] = pays_commission
-    if bonus is not None:
-        request_body["bonus"] = bonus
-    if commission_bonus is not None:
-        request_body["commissionBonus"] = commission_bonus
-    if external_data is not None:
-        request_body["externalData"] = external_data
-    if budget_cost_code is not None:
-        request_body["budgetCostCode"] = budget_cost_code
-    if budget_cost_type is not None:
-        request_body["budgetCostType"] = budget_cost_type
+    values = (
+        display_name, service_materials, service_equipment, recommendations, upgrades, warranty,
+        categories, price, member_price, add_on_price, add_on_member_price, taxable, account,
+        intacct_gl_group_account, hours, is_labor, assets, active, cross_sale_group,
+        pays_commission, bonus, commission_bonus, external_data, budget_cost_code, budget_cost_type
+    )
+    request_body.update((k, v) for k, v in zip(_CREATE_SERVICE_KEYS, values) if v is not None)
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(url, headers=headers, json=request_body)
-        response.raise_for_status()
-        return response.json()
+    return await _request("POST", "/services", json=request_body)
 
 @mcp.tool()
 async def get_service_by_id(
@@ -708,24 +598,20 @@ async def get_service_by_id(
         assets, recommendations, upgrades, and metadata.
         Returns an error dict if the service is not found.
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY
-    }
-
-    url = f"https://api.servicetitan.io/pricebook/v2/tenant/{TENANT_ID}/services/{service_id}"
-
     params = {}
     if external_data_application_guid is not None:
         params["externalDataApplicationGuid"] = external_data_application_guid
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers, params=params)
-        if response.status_code == 404:
-            return {"error": f"Service {service_id} not found"}
-        response.raise_for_status()
-        return response.json()
+    return await _request("GET", f"/services/{service_id}", params=params, not_found_msg=f"Service {service_id} not found")
+
+# Optional body fields for update_service, in the same order as its arguments
+_UPDATE_SERVICE_KEYS = (
+    "code", "displayName", "description", "warranty", "categories", "price", "memberPrice",
+    "addOnPrice", "addOnMemberPrice", "taxable", "account", "intacctGlGroupAccount", "hours",
+    "isLabor", "recommendations", "upgrades", "assets", "serviceMaterials", "serviceEquipment",
+    "active", "crossSaleGroup", "paysCommission", "bonus", "commissionBonus", "externalData",
+    "budgetCostCode", "budgetCostType"
+)
 
 @mcp.tool()
 async def update_service(
@@ -791,80 +677,17 @@ async def update_service(
         budget_cost_code: The Budget CostCode segment for this entity
         budget_cost_type: The Budget CostType segment for this entity
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY,
-        "Content-Type": "application/json"
-    }
-
-    url = f"https://api.servicetitan.io/pricebook/v2/tenant/{TENANT_ID}/services/{service_id}"
-
     # Build request body with only non-None values
-    request_body = {}
-
-    # Add optional fields only if they are not None
-    if code is not None:
-        request_body["code"] = code
-    if display_name is not None:
-        request_body["displayName"] = display_name
-    if description is not None:
-        request_body["description"] = description
-    if warranty is not None:
-        request_body["warranty"] = warranty
-    if categories is not None:
-        request_body["categories"] = categories
-    if price is not None:
-        request_body["price"] = price
-    if member_price is not None:
-        request_body["memberPrice"] = member_price
-    if add_on_price is not None:
-        request_body["addOnPrice"] = add_on_price
-    if add_on_member_price is not None:
-        request_body["addOnMemberPrice"] = add_on_member_price
-    if taxable is not None:
-        request_body["taxable"] = taxable
-    if account is not None:
-        request_body["account"] = account
-    if intacct_gl_group_account is not None:
-        request_body["intacctGlGroupAccount"] = intacct_gl_group_account
-    if hours is not None:
-        request_body["hours"] = hours
-    if is_labor is not None:
-        request_body["isLabor"] = is_labor
-    if recommendations is not None:
-        request_body["recommendations"] = recommendations
-    if upgrades is not None:
-        request_body["upgrades"] = upgrades
-    if assets is not None:
-        request_body["assets"] = assets
-    if service_materials is not None:
-        request_body["serviceMaterials"] = service_materials
-    if service_equipment is not None:
-        request_body["serviceEquipment"] = service_equipment
-    if active is not None:
-        request_body["active"] = active
-    if cross_sale_group is not None:
-        request_body["crossSaleGroup"] = cross_sale_group
-    if pays_commission is not None:
-        request_body["paysCommission"] = pays_commission
-    if bonus is not None:
-        request_body["bonus"] = bonus
-    if commission_bonus is not None:
-        request_body["commissionBonus"] = commission_bonus
-    if external_data is not None:
-        request_body["externalData"] = external_data
-    if budget_cost_code is not None:
-        request_body["budgetCostCode"] = budget_cost_code
-    if budget_cost_type is not None:
-        request_body["budgetCostType"] = budget_cost_type
+    values = (
+        code, display_name, description, warranty, categories, price, member_price, add_on_price,
+        add_on_member_price, taxable, account, intacct_gl_group_account, hours, is_labor,
+        recommendations, upgrades, assets, service_materials, service_equipment, active,
+        cross_sale_group, pays_commission, bonus, commission_bonus, external_data, budget_cost_code,
+        budget_cost_type
+    )
+    request_body = {k: v for k, v in zip(_UPDATE_SERVICE_KEYS, values) if v is not None}
 
-    async with httpx.AsyncClient() as client:
-        response = await client.patch(url, headers=headers, json=request_body)
-        if response.status_code == 404:
-            return {"error": f"Service {service_id} not found"}
-        response.raise_for_status()
-        return response.json()
+    return await _request("PATCH", f"/services/{service_id}", json=request_body, not_found_msg=f"Service {service_id} not found")
 
 @mcp.tool()
 async def delete_material(material_id: str) -> dict:
@@ -877,20 +700,13 @@ async def delete_material(material_id: str) -> dict:
     Returns:
         Success confirmation or error if material not found.
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY
-    }
-
-    url = f"https://api.servicetitan.io/pricebook/v2/tenant/{TENANT_ID}/materials/{material_id}"
-
-    async with httpx.AsyncClient() as client:
-        response = await client.delete(url, headers=headers)
-        if response.status_code == 404:
-            return {"error": f"Material {material_id} not found"}
-        response.raise_for_status()
-        return {"success": f"Material {material_id} deleted successfully"}
+    try:
+        result = await _request("DELETE", f"/materials/{material_id}", none_on_404=True)
+    finally:
+        invalidate_cache(BASE_URL, f"/materials/{material_id}")
+    if result is None:
+        return {"error": f"Material {material_id} not found"}
+    return {"success": f"Material {material_id} deleted successfully"}
 
 @mcp.tool()
 async def delete_service(service_id: str) -> dict:
@@ -903,20 +719,10 @@ async def delete_service(service_id: str) -> dict:
     Returns:
         Success confirmation or error if service not found.
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY
-    }
-
-    url = f"https://api.servicetitan.io/pricebook/v2/tenant/{TENANT_ID}/services/{service_id}"
-
-    async with httpx.AsyncClient() as client:
-        response = await client.delete(url, headers=headers)
-        if response.status_code == 404:
-            return {"error": f"Service {service_id} not found"}
-        response.raise_for_status()
-        return {"success": f"Service {service_id} deleted successfully"}
+    result = await _request("DELETE", f"/services/{service_id}", none_on_404=True)
+    if result is None:
+        return {"error": f"Service {service_id} not found"}
+    return {"success": f"Service {service_id} deleted successfully"}
 
 # CATEGORIES ENDPOINTS
 
@@ -948,34 +754,44 @@ async def get_categories(
         modified_before: Return items modified before date/time (RFC3339 format)
         modified_on_or_after: Return items modified on or after date/time (RFC3339 format)
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY
-    }
+    params = {k: v for k, v in (
+        ("page", page),
+        ("pageSize", page_size),
+        ("includeTotal", include_total),
+        ("sort", sort),
+        ("categoryType", category_type),
+        ("active", active),
+        ("createdBefore", created_before),
+        ("createdOnOrAfter", created_on_or_after),
+        ("modifiedBefore", modified_before),
+        ("modifiedOnOrAfter", modified_on_or_after)
+    ) if v is not None}
 
-    url = f"https://api.servicetitan.io/pricebook/v2/tenant/{TENANT_ID}/categories"
-
-    params = {
-        "page": page,
-        "pageSize": page_size,
-        "includeTotal": include_total,
-        "sort": sort,
-        "categoryType": category_type,
-        "active": active,
-        "createdBefore": created_before,
-        "createdOnOrAfter": created_on_or_after,
-        "modifiedBefore": modified_before,
-        "modifiedOnOrAfter": modified_on_or_after
-    }
+    return await _request("GET", "/categories", params=params)
+
+async def get_all_categories(page_size: int = 200, concurrency: int = 8, **filters: Any) -> dict:
+    """
+    Retrieve every category matching the filters in one call.
 
-    # Remove None values from params
-    clean_params = {k: v for k, v in params.items() if v is not None}
+    The first page reports the total count, then the remaining pages are
+    requested concurrently instead of one get_categories call per page.
+    Accepts the same filters as get_categories. Pages that fail are listed
+    under "errors" (see servicetitan_common.fetch_all_pages).
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers, params=clean_params)
-        response.raise_for_status()
-        return response.json()
+    Args:
+        page_size: Number of records to request per page
+        concurrency: Maximum number of pages requested at once
+    """
+    return await _get_all_pages(get_categories, page_size, concurrency, filters)
+
+get_all_categories.__signature__ = _all_pages_signature(get_categories)
+mcp.tool()(get_all_categories)
+
+# Optional body fields for create_category, in the same order as its arguments
+_CREATE_CATEGORY_KEYS = (
+    "active", "description", "parentId", "position", "image", "categoryType", "businessUnitIds",
+    "skuImages", "skuVideos"
+)
 
 @mcp.tool()
 async def create_category(
@@ -1005,40 +821,15 @@ async def create_category(
         sku_images: List of SKU image URLs
         sku_videos: List of SKU video URLs
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY,
-        "Content-Type": "application/json"
-    }
-
-    url = f"https://api.servicetitan.io/pricebook/v2/tenant/{TENANT_ID}/categories"
-
     request_body = {"name": name}
 
-    if active is not None:
-        request_body["active"] = active
-    if description is not None:
-        request_body["description"] = description
-    if parent_id is not None:
-        request_body["parentId"] = parent_id
-    if position is not None:
-        request_body["position"] = position
-    if image is not None:
-        request_body["image"] = image
-    if category_type is not None:
-        request_body["categoryType"] = category_type
-    if business_unit_ids is not None:
-        request_body["businessUnitIds"] = business_unit_ids
-    if sku_images is not None:
-        request_body["skuImages"] = sku_images
-    if sku_videos is not None:
-        request_body["skuVideos"] = sku_videos
+    values = (
+        active, description, parent_id, position, image, category_type, business_unit_ids,
+        sku_images, sku_videos
+    )
+    request_body.update((k, v) for k, v in zip(_CREATE_CATEGORY_KEYS, values) if v is not None)
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(url, headers=headers, json=request_body)
-        response.raise_for_status()
-        return response.json()
+    return await _request("POST", "/categories", json=request_body)
 
 @mcp.tool()
 async def get_category_by_id(category_id: str) -> dict:
@@ -1048,20 +839,37 @@ async def get_category_by_id(category_id: str) -> dict:
     Args:
         category_id: The ID of the category to retrieve (required)
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY
-    }
+    return await _request("GET", f"/categories/{category_id}", not_found_msg=f"Category {category_id} not found")
+
+@mcp.tool()
+async def batch_get_categories(category_ids: List[str]) -> List[dict]:
+    """
+    Retrieve many categories by ID in one call.
 
-    url = f"https://api.servicetitan.io/pricebook/v2/tenant/{TENANT_ID}/categories/{category_id}"
+    The lookups are sent concurrently and multiplexed over the shared HTTP/2
+    connection instead of one get_category_by_id call per ID.
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers)
-        if response.status_code == 404:
-            return {"error": f"Category {category_id} not found"}
-        response.raise_for_status()
-        return response.json()
+    Args:
+        category_ids: IDs of the categories to retrieve
+
+    Returns:
+        List of per-category results in the same order as category_ids. Missing
+        or failed lookups contain an "error" key so partial failures are visible.
+    """
+    responses = await asyncio.gather(
+        *(get_category_by_id(category_id) for category_id in category_ids),
+        return_exceptions=True
+    )
+    return [
+        {"error": "Request failed", "message": str(response)} if isinstance(response, Exception) else response
+        for response in responses
+    ]
+
+# Optional body fields for update_category, in the same order as its arguments
+_UPDATE_CATEGORY_KEYS = (
+    "name", "active", "description", "parentId", "position", "image", "categoryType",
+    "businessUnitIds", "skuImages", "skuVideos"
+)
 
 @mcp.tool()
 async def update_category(
@@ -1093,44 +901,13 @@ async def update_category(
         sku_images: List of SKU image URLs
         sku_videos: List of SKU video URLs
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY,
-        "Content-Type": "application/json"
-    }
+    values = (
+        name, active, description, parent_id, position, image, category_type, business_unit_ids,
+        sku_images, sku_videos
+    )
+    request_body = {k: v for k, v in zip(_UPDATE_CATEGORY_KEYS, values) if v is not None}
 
-    url = f"https://api.servicetitan.io/pricebook/v2/tenant/{TENANT_ID}/categories/{category_id}"
-
-    request_body = {}
-
-    if name is not None:
-        request_body["name"] = name
-    if active is not None:
-        request_body["active"] = active
-    if description is not None:
-        request_body["description"] = description
-    if parent_id is not None:
-        request_body["parentId"] = parent_id
-    if position is not None:
-        request_body["position"] = position
-    if image is not None:
-        request_body["image"] = image
-    if category_type is not None:
-        request_body["categoryType"] = category_type
-    if business_unit_ids is not None:
-        request_body["businessUnitIds"] = business_unit_ids
-    if sku_images is not None:
-        request_body["skuImages"] = sku_images
-    if sku_videos is not None:
-        request_body["skuVideos"] = sku_videos
-
-    async with httpx.AsyncClient() as client:
-        response = await client.patch(url, headers=headers, json=request_body)
-        if response.status_code == 404:
-            return {"error": f"Category {category_id} not found"}
-        response.raise_for_status()
-        return response.json()
+    return await _request("PATCH", f"/categories/{category_id}", json=request_body, not_found_msg=f"Category {category_id} not found")
 
 @mcp.tool()
 async def delete_category(category_id: str) -> dict:
@@ -1140,20 +917,10 @@ async def delete_category(category_id: str) -> dict:
     Args:
         category_id: The ID of the category to delete (required)
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY
-    }
-
-    url = f"https://api.servicetitan.io/pricebook/v2/tenant/{TENANT_ID}/categories/{category_id}"
-
-    async with httpx.AsyncClient() as client:
-        response = await client.delete(url, headers=headers)
-        if response.status_code == 404:
-            return {"error": f"Category {category_id} not found"}
-        response.raise_for_status()
-        return {"success": f"Category {category_id} deleted successfully"}
+    result = await _request("DELETE", f"/categories/{category_id}", none_on_404=True)
+    if result is None:
+        return {"error": f"Category {category_id} not found"}
+    return {"success": f"Category {category_id} deleted successfully"}
 
 # EQUIPMENT ENDPOINTS
 
@@ -1191,37 +958,50 @@ async def get_equipment(
         external_data_key: Filter by external data key
         external_data_values: Filter by external data values
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY
-    }
+    params = {k: v for k, v in (
+        ("page", page),
+        ("pageSize", page_size),
+        ("includeTotal", include_total),
+        ("sort", sort),
+        ("ids", ids),
+        ("createdBefore", created_before),
+        ("createdOnOrAfter", created_on_or_after),
+        ("modifiedBefore", modified_before),
+        ("modifiedOnOrAfter", modified_on_or_after),
+        ("active", active),
+        ("externalDataApplicationGuid", external_data_application_guid),
+        ("externalDataKey", external_data_key),
+        ("externalDataValues", external_data_values)
+    ) if v is not None}
+
+    return await _request("GET", "/equipment", params=params)
+
+async def get_all_equipment(page_size: int = 200, concurrency: int = 8, **filters: Any) -> dict:
+    """
+    Retrieve every equipment item matching the filters in one call.
+
+    The first page reports the total count, then the remaining pages are
+    requested concurrently instead of one get_equipment call per page.
+    Accepts the same filters as get_equipment. Pages that fail are listed
+    under "errors" (see servicetitan_common.fetch_all_pages).
 
-    url = f"https://api.servicetitan.io/pricebook/v2/tenant/{TENANT_ID}/equipment"
-
-    params = {
-        "page": page,
-        "pageSize": page_size,
-        "includeTotal": include_total,
-        "sort": sort,
-        "ids": ids,
-        "createdBefore": created_before,
-        "createdOnOrAfter": created_on_or_after,
-        "modifiedBefore": modified_before,
-        "modifiedOnOrAfter": modified_on_or_after,
-        "active": active,
-        "externalDataApplicationGuid": external_data_application_guid,
-        "externalDataKey": external_data_key,
-        "externalDataValues": external_data_values
-    }
+    Args:
+        page_size: Number of records to request per page
+        concurrency: Maximum number of pages requested at once
+    """
+    return await _get_all_pages(get_equipment, page_size, concurrency, filters)
 
-    # Remove None values from params
-    clean_params = {k: v for k, v in params.items() if v is not None}
+get_all_equipment.__signature__ = _all_pages_signature(get_equipment)
+mcp.tool()(get_all_equipment)
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers, params=clean_params)
-        response.raise_for_status()
-        return response.json()
+# Optional body fields for create_equipment, in the same order as its arguments
+_CREATE_EQUIPMENT_KEYS = (
+    "displayName", "cost", "active", "price", "memberPrice", "addOnPrice", "addOnMemberPrice",
+    "hours", "bonus", "commissionBonus", "paysCommission", "deductAsJobCost", "unitOfMeasure",
+    "isInventory", "account", "costOfSaleAccount", "assetAccount", "intacctGlGroupAccount",
+    "taxable", "primaryVendor", "otherVendors", "assets", "categories", "externalData",
+    "budgetCostCode", "budgetCostType"
+)
 
 @mcp.tool()
 async def create_equipment(
@@ -1287,77 +1067,21 @@ async def create_equipment(
         budget_cost_code: The Budget CostCode segment for this entity
         budget_cost_type: The Budget CostType segment for this entity
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY,
-        "Content-Type": "application/json"
-    }
-
-    url = f"https://api.servicetitan.io/pricebook/v2/tenant/{TENANT_ID}/equipment"
-
     request_body = {
         "code": code,
         "description": description
     }
 
-    if display_name is not None:
-        request_body["displayName"] = display_name
-    if cost is not None:
-        request_body["cost"] = cost
-    if active is not None:
-        request_body["active"] = active
-    if price is not None:
-        request_body["price"] = price
-    if member_price is not None:
-        request_body["memberPrice"] = member_price
-    if add_on_price is not None:
-        request_body["addOnPrice"] = add_on_price
-    if add_on_member_price is not None:
-        request_body["addOnMemberPrice"] = add_on_member_price
-    if hours is not None:
-        request_body["hours"] = hours
-    if bonus is not None:
-        request_body["bonus"] = bonus
-    if commission_bonus is not None:
-        request_body["commissionBonus"] = commission_bonus
-    if pays_commission is not None:
-        request_body["paysCommission"] = pays_commission
-    if deduct_as_job_cost is not None:
-        request_body["deductAsJobCost"] = deduct_as_job_cost
-    if unit_of_measure is not None:
-        request_body["unitOfMeasure"] = unit_of_measure
-    if is_inventory is not None:
-        request_body["isInventory"] = is_inventory
-    if account is not None:
-        request_body["account"] = account
-    if cost_of_sale_account is not None:
-        request_body["costOfSaleAccount"] = cost_of_sale_account
-    if asset_account is not None:
-        request_body["assetAccount"] = asset_account
-    if intacct_gl_group_account is not None:
-        request_body["intacctGlGroupAccount"] = intacct_gl_group_account
-    if taxable is not None:
-        request_body["taxable"] = taxable
-    if primary_vendor is not None:
-        request_body["primaryVendor"] = primary_vendor
-    if other_vendors is not None:
-        request_body["otherVendors"] = other_vendors
-    if assets is not None:
-        request_body["assets"] = assets
-    if categories is not None:
-        request_body["categories"] = categories
-    if external_data is not None:
-        request_body["externalData"] = external_data
-    if budget_cost_code is not None:
-        request_body["budgetCostCode"] = budget_cost_code
-    if budget_cost_type is not None:
-        request_body["budgetCostType"] = budget_cost_type
+    values = (
+        display_name, cost, active, price, member_price, add_on_price, add_on_member_price, hours,
+        bonus, commission_bonus, pays_commission, deduct_as_job_cost, unit_of_measure, is_inventory,
+        account, cost_of_sale_account, asset_account, intacct_gl_group_account, taxable,
+        primary_vendor, other_vendors, assets, categories, external_data, budget_cost_code,
+        budget_cost_type
+    )
+    request_body.update((k, v) for k, v in zip(_CREATE_EQUIPMENT_KEYS, values) if v is not None)
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(url, headers=headers, json=request_body)
-        response.raise_for_status()
-        return response.json()
+    return await _request("POST", "/equipment", json=request_body)
 
 @mcp.tool()
 async def get_equipment_by_id(
@@ -1371,24 +1095,20 @@ async def get_equipment_by_id(
         equipment_id: The ID of the equipment to retrieve (required)
         external_data_application_guid: Optional GUID for filtering external data
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY
-    }
-
-    url = f"https://api.servicetitan.io/pricebook/v2/tenant/{TENANT_ID}/equipment/{equipment_id}"
-
     params = {}
     if external_data_application_guid is not None:
         params["externalDataApplicationGuid"] = external_data_application_guid
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers, params=params)
-        if response.status_code == 404:
-            return {"error": f"Equipment {equipment_id} not found"}
-        response.raise_for_status()
-        return response.json()
+    return await _request("GET", f"/equipment/{equipment_id}", params=params, not_found_msg=f"Equipment {equipment_id} not found")
+
+# Optional body fields for update_equipment, in the same order as its arguments
+_UPDATE_EQUIPMENT_KEYS = (
+    "code", "displayName", "description", "cost", "active", "price", "memberPrice", "addOnPrice",
+    "addOnMemberPrice", "hours", "bonus", "commissionBonus", "paysCommission", "deductAsJobCost",
+    "unitOfMeasure", "isInventory", "account", "costOfSaleAccount", "assetAccount",
+    "intacctGlGroupAccount", "taxable", "primaryVendor", "otherVendors", "assets", "categories",
+    "externalData", "budgetCostCode", "budgetCostType"
+)
 
 @mcp.tool()
 async def update_equipment(
@@ -1456,80 +1176,16 @@ async def update_equipment(
         budget_cost_code: The Budget CostCode segment for this entity
         budget_cost_type: The Budget CostType segment for this entity
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY,
-        "Content-Type": "application/json"
-    }
+    values = (
+        code, display_name, description, cost, active, price, member_price, add_on_price,
+        add_on_member_price, hours, bonus, commission_bonus, pays_commission, deduct_as_job_cost,
+        unit_of_measure, is_inventory, account, cost_of_sale_account, asset_account,
+        intacct_gl_group_account, taxable, primary_vendor, other_vendors, assets, categories,
+        external_data, budget_cost_code, budget_cost_type
+    )
+    request_body = {k: v for k, v in zip(_UPDATE_EQUIPMENT_KEYS, values) if v is not None}
 
-    url = f"https://api.servicetitan.io/pricebook/v2/tenant/{TENANT_ID}/equipment/{equipment_id}"
-
-    request_body = {}
-
-    if code is not None:
-        request_body["code"] = code
-    if display_name is not None:
-        request_body["displayName"] = display_name
-    if description is not None:
-        request_body["description"] = description
-    if cost is not None:
-        request_body["cost"] = cost
-    if active is not None:
-        request_body["active"] = active
-    if price is not None:
-        request_body["price"] = price
-    if member_price is not None:
-        request_body["memberPrice"] = member_price
-    if add_on_price is not None:
-        request_body["addOnPrice"] = add_on_price
-    if add_on_member_price is not None:
-        request_body["addOnMemberPrice"] = add_on_member_price
-    if hours is not None:
-        request_body["hours"] = hours
-    if bonus is not None:
-        request_body["bonus"] = bonus
-    if commission_bonus is not None:
-        request_body["commissionBonus"] = commission_bonus
-    if pays_commission is not None:
-        request_body["paysCommission"] = pays_commission
-    if deduct_as_job_cost is not None:
-        request_body["deductAsJobCost"] = deduct_as_job_cost
-    if unit_of_measure is not None:
-        request_body["unitOfMeasure"] = unit_of_measure
-    if is_inventory is not None:
-        request_body["isInventory"] = is_inventory
-    if account is not None:
-        request_body["account"] = account
-    if cost_of_sale_account is not None:
-        request_body["costOfSaleAccount"] = cost_of_sale_account
-    if asset_account is not None:
-        request_body["assetAccount"] = asset_account
-    if intacct_gl_group_account is not None:
-        request_body["intacctGlGroupAccount"] = intacct_gl_group_account
-    if taxable is not None:
-        request_body["taxable"] = taxable
-    if primary_vendor is not None:
-        request_body["primaryVendor"] = primary_vendor
-    if other_vendors is not None:
-        request_body["otherVendors"] = other_vendors
-    if assets is not None:
-        request_body["assets"] = assets
-    if categories is not None:
-        request_body["categories"] = categories
-    if external_data is not None:
-        request_body["externalData"] = external_data
-    if budget_cost_code is not None:
-        request_body["budgetCostCode"] = budget_cost_code
-    if budget_cost_type is not None:
-        request_body["budgetCostType"] = budget_cost_type
-
-    async with httpx.AsyncClient() as client:
-        response = await client.patch(url, headers=headers, json=request_body)
-        if response.status_code == 404:
-            return {"error": f"Equipment {equipment_id} not found"}
-        response.raise_for_status()
-        return response.json()
+    return await _request("PATCH", f"/equipment/{equipment_id}", json=request_body, not_found_msg=f"Equipment {equipment_id} not found")
 
 @mcp.tool()
 async def delete_equipment(equipment_id: str) -> dict:
@@ -1539,20 +1195,10 @@ async def delete_equipment(equipment_id: str) -> dict:
     Args:
         equipment_id: The ID of the equipment to delete (required)
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY
-    }
-
-    url = f"https://api.servicetitan.io/pricebook/v2/tenant/{TENANT_ID}/equipment/{equipment_id}"
-
-    async with httpx.AsyncClient() as client:
-        response = await client.delete(url, headers=headers)
-        if response.status_code == 404:
-            return {"error": f"Equipment {equipment_id} not found"}
-        response.raise_for_status()
-        return {"success": f"Equipment {equipment_id} deleted successfully"}
+    result = await _request("DELETE", f"/equipment/{equipment_id}", none_on_404=True)
+    if result is None:
+        return {"error": f"Equipment {equipment_id} not found"}
+    return {"success": f"Equipment {equipment_id} deleted successfully"}
 
 # DISCOUNTS AND FEES ENDPOINTS
 
@@ -1590,37 +1236,23 @@ async def get_discounts_and_fees(
         external_data_key: Filter by external data key
         external_data_values: Filter by external data values
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY
-    }
-
-    url = f"https://api.servicetitan.io/pricebook/v2/tenant/{TENANT_ID}/discounts-and-fees"
-
-    params = {
-        "page": page,
-        "pageSize": page_size,
-        "includeTotal": include_total,
-        "sort": sort,
-        "ids": ids,
-        "createdBefore": created_before,
-        "createdOnOrAfter": created_on_or_after,
-        "modifiedBefore": modified_before,
-        "modifiedOnOrAfter": modified_on_or_after,
-        "active": active,
-        "externalDataApplicationGuid": external_data_application_guid,
-        "externalDataKey": external_data_key,
-        "externalDataValues": external_data_values
-    }
-
-    # Remove None values from params
-    clean_params = {k: v for k, v in params.items() if v is not None}
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers, params=clean_params)
-        response.raise_for_status()
-        return response.json()
+    params = {k: v for k, v in (
+        ("page", page),
+        ("pageSize", page_size),
+        ("includeTotal", include_total),
+        ("sort", sort),
+        ("ids", ids),
+        ("createdBefore", created_before),
+        ("createdOnOrAfter", created_on_or_after),
+        ("modifiedBefore", modified_before),
+        ("modifiedOnOrAfter", modified_on_or_after),
+        ("active", active),
+        ("externalDataApplicationGuid", external_data_application_guid),
+        ("externalDataKey", external_data_key),
+        ("externalDataValues", external_data_values)
+    ) if v is not None}
+
+    return await _request("GET", "/discounts-and-fees", params=params)
 
 @mcp.tool()
 async def create_discount_or_fee(
@@ -1664,15 +1296,6 @@ async def create_discount_or_fee(
         budget_cost_code: The Budget CostCode segment for this entity
         budget_cost_type: The Budget CostType segment for this entity
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY,
-        "Content-Type": "application/json"
-    }
-
-    url = f"https://api.servicetitan.io/pricebook/v2/tenant/{TENANT_ID}/discounts-and-fees"
-
     request_body = {
         "code": code,
         "description": description,
@@ -1708,10 +1331,7 @@ async def create_discount_or_fee(
     if budget_cost_type is not None:
         request_body["budgetCostType"] = budget_cost_type
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(url, headers=headers, json=request_body)
-        response.raise_for_status()
-        return response.json()
+    return await _request("POST", "/discounts-and-fees", json=request_body)
 
 @mcp.tool()
 async def get_discount_or_fee_by_id(
@@ -1725,24 +1345,11 @@ async def get_discount_or_fee_by_id(
         discount_fee_id: The ID of the discount/fee to retrieve (required)
         external_data_application_guid: Optional GUID for filtering external data
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY
-    }
-
-    url = f"https://api.servicetitan.io/pricebook/v2/tenant/{TENANT_ID}/discounts-and-fees/{discount_fee_id}"
-
     params = {}
     if external_data_application_guid is not None:
         params["externalDataApplicationGuid"] = external_data_application_guid
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers, params=params)
-        if response.status_code == 404:
-            return {"error": f"Discount/Fee {discount_fee_id} not found"}
-        response.raise_for_status()
-        return response.json()
+    return await _request("GET", f"/discounts-and-fees/{discount_fee_id}", params=params, not_found_msg=f"Discount/Fee {discount_fee_id} not found")
 
 @mcp.tool()
 async def update_discount_or_fee(
@@ -1788,15 +1395,6 @@ async def update_discount_or_fee(
         budget_cost_code: The Budget CostCode segment for this entity
         budget_cost_type: The Budget CostType segment for this entity
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY,
-        "Content-Type": "application/json"
-    }
-
-    url = f"https://api.servicetitan.io/pricebook/v2/tenant/{TENANT_ID}/discounts-and-fees/{discount_fee_id}"
-
     request_body = {}
 
     if code is not None:
@@ -1834,12 +1432,7 @@ async def update_discount_or_fee(
     if budget_cost_type is not None:
         request_body["budgetCostType"] = budget_cost_type
 
-    async with httpx.AsyncClient() as client:
-        response = await client.patch(url, headers=headers, json=request_body)
-        if response.status_code == 404:
-            return {"error": f"Discount/Fee {discount_fee_id} not found"}
-        response.raise_for_status()
-        return response.json()
+    return await _request("PATCH", f"/discounts-and-fees/{discount_fee_id}", json=request_body, not_found_msg=f"Discount/Fee {discount_fee_id} not found")
 
 @mcp.tool()
 async def delete_discount_or_fee(discount_fee_id: str) -> dict:
@@ -1849,20 +1442,10 @@ async def delete_discount_or_fee(discount_fee_id: str) -> dict:
     Args:
         discount_fee_id: The ID of the discount/fee to delete (required)
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY
-    }
-
-    url = f"https://api.servicetitan.io/pricebook/v2/tenant/{TENANT_ID}/discounts-and-fees/{discount_fee_id}"
-
-    async with httpx.AsyncClient() as client:
-        response = await client.delete(url, headers=headers)
-        if response.status_code == 404:
-            return {"error": f"Discount/Fee {discount_fee_id} not found"}
-        response.raise_for_status()
-        return {"success": f"Discount/Fee {discount_fee_id} deleted successfully"}
+    result = await _request("DELETE", f"/discounts-and-fees/{discount_fee_id}", none_on_404=True)
+    if result is None:
+        return {"error": f"Discount/Fee {discount_fee_id} not found"}
+    return {"success": f"Discount/Fee {discount_fee_id} deleted successfully"}
 
 # IMAGES ENDPOINTS
 
@@ -1880,27 +1463,13 @@ async def get_images(
         page_size: Number of records to return (50 by default)
         include_total: Whether total count should be returned
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY
-    }
-
-    url = f"https://api.servicetitan.io/pricebook/v2/tenant/{TENANT_ID}/images"
+    params = {k: v for k, v in (
+        ("page", page),
+        ("pageSize", page_size),
+        ("includeTotal", include_total)
+    ) if v is not None}
 
-    params = {
-        "page": page,
-        "pageSize": page_size,
-        "includeTotal": include_total
-    }
-
-    # Remove None values from params
-    clean_params = {k: v for k, v in params.items() if v is not None}
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers, params=clean_params)
-        response.raise_for_status()
-        return response.json()
+    return await _request("GET", "/images", params=params)
 
 @mcp.tool()
 async def upload_image(
@@ -1916,15 +1485,6 @@ async def upload_image(
         file_name: Name of the image file (required)
         content_type: MIME type of the image (e.g., 'image/jpeg', 'image/png')
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY,
-        "Content-Type": "application/json"
-    }
-
-    url = f"https://api.servicetitan.io/pricebook/v2/tenant/{TENANT_ID}/images"
-
     request_body = {
         "imageData": image_data,
         "fileName": file_name
@@ -1933,10 +1493,7 @@ async def upload_image(
     if content_type is not None:
         request_body["contentType"] = content_type
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(url, headers=headers, json=request_body)
-        response.raise_for_status()
-        return response.json()
+    return await _request("POST", "/images", json=request_body)
 
 # MATERIALS MARKUP ENDPOINTS
 
@@ -1954,27 +1511,13 @@ async def get_materials_markup(
         page_size: Number of records to return (50 by default)
         include_total: Whether total count should be returned
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY
-    }
-
-    url = f"https://api.servicetitan.io/pricebook/v2/tenant/{TENANT_ID}/materialsmarkup"
-
-    params = {
-        "page": page,
-        "pageSize": page_size,
-        "includeTotal": include_total
-    }
-
-    # Remove None values from params
-    clean_params = {k: v for k, v in params.items() if v is not None}
+    params = {k: v for k, v in (
+        ("page", page),
+        ("pageSize", page_size),
+        ("includeTotal", include_total)
+    ) if v is not None}
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers, params=clean_params)
-        response.raise_for_status()
-        return response.json()
+    return await _request("GET", "/materialsmarkup", params=params)
 
 @mcp.tool()
 async def create_materials_markup(
@@ -1994,15 +1537,6 @@ async def create_materials_markup(
         vendor_ids: List of vendor IDs to apply markup to
         active: Whether the markup configuration is active
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY,
-        "Content-Type": "application/json"
-    }
-
-    url = f"https://api.servicetitan.io/pricebook/v2/tenant/{TENANT_ID}/materialsmarkup"
-
     request_body = {
         "name": name,
         "markupPercentage": markup_percentage
@@ -2015,10 +1549,7 @@ async def create_materials_markup(
     if active is not None:
         request_body["active"] = active
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(url, headers=headers, json=request_body)
-        response.raise_for_status()
-        return response.json()
+    return await _request("POST", "/materialsmarkup", json=request_body)
 
 @mcp.tool()
 async def get_materials_markup_by_id(markup_id: str) -> dict:
@@ -2028,20 +1559,7 @@ async def get_materials_markup_by_id(markup_id: str) -> dict:
     Args:
         markup_id: The ID of the markup configuration to retrieve (required)
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY
-    }
-
-    url = f"https://api.servicetitan.io/pricebook/v2/tenant/{TENANT_ID}/materialsmarkup/{markup_id}"
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers)
-        if response.status_code == 404:
-            return {"error": f"Materials markup {markup_id} not found"}
-        response.raise_for_status()
-        return response.json()
+    return await _request("GET", f"/materialsmarkup/{markup_id}", not_found_msg=f"Materials markup {markup_id} not found")
 
 @mcp.tool()
 async def update_materials_markup(
@@ -2063,15 +1581,6 @@ async def update_materials_markup(
         vendor_ids: List of vendor IDs to apply markup to
         active: Whether the markup configuration is active
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY,
-        "Content-Type": "application/json"
-    }
-
-    url = f"https://api.servicetitan.io/pricebook/v2/tenant/{TENANT_ID}/materialsmarkup/{markup_id}"
-
     request_body = {}
 
     if name is not None:
@@ -2085,12 +1594,7 @@ async def update_materials_markup(
     if active is not None:
         request_body["active"] = active
 
-    async with httpx.AsyncClient() as client:
-        response = await client.put(url, headers=headers, json=request_body)
-        if response.status_code == 404:
-            return {"error": f"Materials markup {markup_id} not found"}
-        response.raise_for_status()
-        return response.json()
+    return await _request("PUT", f"/materialsmarkup/{markup_id}", json=request_body, not_found_msg=f"Materials markup {markup_id} not found")
 
 # CLIENT SPECIFIC PRICING ENDPOINTS
 
@@ -2114,30 +1618,16 @@ async def get_client_specific_pricing(
         page_size: Number of records to return (50 by default)
         include_total: Whether total count should be returned
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY
-    }
-
-    url = f"https://api.servicetitan.io/pricebook/v2/tenant/{TENANT_ID}/clientspecificpricing"
-
-    params = {
-        "ids": ids,
-        "searchTerm": search_term,
-        "active": active,
-        "page": page,
-        "pageSize": page_size,
-        "includeTotal": include_total
-    }
-
-    # Remove None values from params
-    clean_params = {k: v for k, v in params.items() if v is not None}
+    params = {k: v for k, v in (
+        ("ids", ids),
+        ("searchTerm", search_term),
+        ("active", active),
+        ("page", page),
+        ("pageSize", page_size),
+        ("includeTotal", include_total)
+    ) if v is not None}
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers, params=clean_params)
-        response.raise_for_status()
-        return response.json()
+    return await _request("GET", "/clientspecificpricing", params=params)
 
 @mcp.tool()
 async def update_client_specific_pricing(
@@ -2152,23 +1642,9 @@ async def update_client_specific_pricing(
         exceptions: List of pricing exceptions with skuId, value, and valueType (required)
                    Example: [{"skuId": 123, "value": 10.0, "valueType": "Percent"}]
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY,
-        "Content-Type": "application/json"
-    }
-
-    url = f"https://api.servicetitan.io/pricebook/v2/tenant/{TENANT_ID}/clientspecificpricing/{rate_sheet_id}"
-
     request_body = {"exceptions": exceptions}
 
-    async with httpx.AsyncClient() as client:
-        response = await client.patch(url, headers=headers, json=request_body)
-        if response.status_code == 404:
-            return {"error": f"Rate sheet {rate_sheet_id} not found"}
-        response.raise_for_status()
-        return response.json()
+    return await _request("PATCH", f"/clientspecificpricing/{rate_sheet_id}", json=request_body, not_found_msg=f"Rate sheet {rate_sheet_id} not found")
 
 # EXPORT ENDPOINTS
 
@@ -2177,72 +1653,28 @@ async def export_categories() -> dict:
     """
     Export categories data from ServiceTitan pricebook.
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY
-    }
-
-    url = f"https://api.servicetitan.io/pricebook/v2/tenant/{TENANT_ID}/export/categories"
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers)
-        response.raise_for_status()
-        return response.json()
+    return await _request("GET", "/export/categories")
 
 @mcp.tool()
 async def export_equipment() -> dict:
     """
     Export equipment data from ServiceTitan pricebook.
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY
-    }
-
-    url = f"https://api.servicetitan.io/pricebook/v2/tenant/{TENANT_ID}/export/equipment"
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers)
-        response.raise_for_status()
-        return response.json()
+    return await _request("GET", "/export/equipment")
 
 @mcp.tool()
 async def export_services() -> dict:
     """
     Export services data from ServiceTitan pricebook.
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY
-    }
-
-    url = f"https://api.servicetitan.io/pricebook/v2/tenant/{TENANT_ID}/export/services"
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers)
-        response.raise_for_status()
-        return response.json()
+    return await _request("GET", "/export/services")
 
 @mcp.tool()
 async def export_materials() -> dict:
     """
     Export materials data from ServiceTitan pricebook.
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY
-    }
-
-    url = f"https://api.servicetitan.io/pricebook/v2/tenant/{TENANT_ID}/export/materials"
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers)
-        response.raise_for_status()
-        return response.json()
+    return await _request("GET", "/export/materials")
 
 # PRICEBOOK ENDPOINTS
 
@@ -2272,15 +1704,6 @@ async def create_pricebook_entry(
         effective_date: Effective date (RFC3339 format)
         expiration_date: Expiration date (RFC3339 format)
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY,
-        "Content-Type": "application/json"
-    }
-
-    url = f"https://api.servicetitan.io/pricebook/v2/tenant/{TENANT_ID}/pricebook"
-
     request_body = {
         "skuType": sku_type,
         "skuId": sku_id
@@ -2301,10 +1724,12 @@ async def create_pricebook_entry(
     if expiration_date is not None:
         request_body["expirationDate"] = expiration_date
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(url, headers=headers, json=request_body)
-        response.raise_for_status()
-        return response.json()
+    try:
+        return await _request("POST", "/pricebook", json=request_body)
+    finally:
+        # A material's pricing changes with its pricebook entries; drop get_material_by_id's copy
+        if sku_type == "Material":
+            invalidate_cache(BASE_URL, f"/materials/{sku_id}")
 
 @mcp.tool()
 async def update_pricebook_entry(
@@ -2334,15 +1759,6 @@ async def update_pricebook_entry(
         effective_date: Effective date (RFC3339 format)
         expiration_date: Expiration date (RFC3339 format)
     """
-    token = await get_access_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "ST-App-Key": APP_KEY,
-        "Content-Type": "application/json"
-    }
-
-    url = f"https://api.servicetitan.io/pricebook/v2/tenant/{TENANT_ID}/pricebook"
-
     request_body = {}
 
     if sku_type is not None:
@@ -2364,10 +1780,13 @@ async def update_pricebook_entry(
     if expiration_date is not None:
         request_body["expirationDate"] = expiration_date
 
-    async with httpx.AsyncClient() as client:
-        response = await client.patch(url, headers=headers, json=request_body)
-        response.raise_for_status()
-        return response.json()
+    try:
+        return await _request("PATCH", "/pricebook", json=request_body)
+    finally:
+        # A material's pricing changes with its pricebook entries; drop get_material_by_id's copy
+        if sku_id is not None and sku_type in (None, "Material"):
+            invalidate_cache(BASE_URL, f"/materials/{sku_id}")
 
 if __name__ == "__main__":
+    install_event_loop()
     mcp.run(transport="stdio")